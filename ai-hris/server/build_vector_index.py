@@ -0,0 +1,33 @@
+"""Rebuild the local candidate vector index snapshot from Cosmos DB.
+
+Usage:
+    python build_vector_index.py [--path .cache/vector_index] [--nlist 0]
+
+Run it on a schedule when VECTOR_BACKEND=local; serving workers pick up the new
+snapshot within VECTOR_INDEX_RELOAD_SECONDS.
+"""
+import argparse
+import sys
+
+from loguru import logger
+
+from src.config.env import AppConfig
+from src.repository.database import CosmosDB
+from src.repository.vector_index import LocalVectorIndex
+
+
+def main() -> int:
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Build the local candidate vector index from Cosmos DB")
+    parser.add_argument('--path', default=config.VECTOR_INDEX_PATH, help="Snapshot directory")
+    parser.add_argument('--nlist', type=int, default=config.VECTOR_INDEX_NLIST, help="Number of IVF lists (0 = sqrt(n))")
+    args = parser.parse_args()
+
+    index = LocalVectorIndex(path=args.path, nlist=args.nlist)
+    index.build(CosmosDB(config=config).iter_embeddings())
+    logger.info(f"Vector index written to {args.path} ({len(index)} vectors)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
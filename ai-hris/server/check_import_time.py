@@ -0,0 +1,86 @@
+"""Check that importing the server stays fast and does not load heavy SDKs.
+
+Usage:
+    python check_import_time.py [--budget-ms 1500] [--runs 3] [--top 15]
+
+Imports ``main`` in fresh interpreters with ``-X importtime`` and warm-up
+disabled, reports the slowest imports of the fastest run, and exits non-zero
+when the import takes longer than the budget or pulls in a dependency that
+should only be loaded on first use. Run it in CI or the container build.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Loaded lazily by the clients that need them; importing main must not load them.
+DEFERRED_MODULES = (
+    'semantic_kernel',
+    'playwright',
+    'azure.cosmos',
+    'openai',
+    'PyPDF2',
+    'docx2txt',
+    'bs4',
+)
+
+_PROBE = (
+    "import sys, main; "
+    "print('LOADED=' + ','.join(name for name in {modules!r} if name in sys.modules))"
+)
+
+
+def _measure() -> tuple[float, list[tuple[int, str]], list[str]]:
+    env = dict(os.environ, WARM_UP_ON_START='false')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE.format(modules=DEFERRED_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing main failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented below the module that triggered them.
+        modules.append((int(cumulative_us), name[1:]))
+    main_us = next((cumulative for cumulative, name in modules if name == 'main'), 0)
+    loaded = next(line[len('LOADED='):] for line in result.stdout.splitlines() if line.startswith('LOADED='))
+    return main_us / 1000, modules, [name for name in loaded.split(',') if name]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the import time of the server")
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv('IMPORT_TIME_BUDGET_MS', 1500)), help="Maximum import time of main")
+    parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters to try; the fastest run is reported")
+    parser.add_argument('--top', type=int, default=15, help="Number of slowest direct imports of main to print")
+    args = parser.parse_args()
+
+    elapsed_ms, modules, loaded = min((_measure() for _ in range(max(1, args.runs))), key=lambda run: run[0])
+
+    # Direct imports of main are indented by exactly one level.
+    direct = sorted(
+        ((cumulative, name.strip()) for cumulative, name in modules if name.startswith('  ') and name[2] != ' '),
+        reverse=True
+    )
+    print(f"import main: {elapsed_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for cumulative, name in direct[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: deferred modules imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if elapsed_ms > args.budget_ms:
+        print(f"FAIL: import time {elapsed_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
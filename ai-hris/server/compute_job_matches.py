@@ -0,0 +1,74 @@
+"""Precompute the top-K candidates of every open job.
+
+Usage:
+    python compute_job_matches.py [--jobs open_jobs.json] [--close job-1 job-2] [--full]
+
+The jobs file is a JSON array or JSON Lines file of objects matching JobData,
+each with a job_id; they are added to (or updated in) the open jobs kept in
+JOB_MATCH_STORE_PATH. Every open job's matches are then brought up to date:
+only new or changed jobs are embedded, and only candidates added or changed
+since the previous run are scored unless a job needs a full pass. Run it on a
+schedule; recommend requests with a job_id read the stored matches.
+"""
+import argparse
+import asyncio
+import sys
+
+from loguru import logger
+from pydantic import ValidationError
+
+from index_candidates import read_records
+from src.config.env import AppConfig
+from src.domain.candidate_recommendation import JobData
+from src.repository.database import CosmosDB
+from src.repository.embedding import AzureAIEmbedding
+from src.repository.match_store import MatchStore
+from src.usecase.job_matching import JobMatcher
+
+
+def load_jobs(path: str) -> list[dict]:
+    jobs = []
+    for index, record in enumerate(read_records(path)):
+        try:
+            job = JobData(**record)
+        except ValidationError as ve:
+            logger.warning(f"Skipping invalid job at line/index {index}: {ve}")
+            continue
+        if not job.job_id:
+            logger.warning(f"Skipping job without job_id at line/index {index}")
+            continue
+        jobs.append(job.model_dump())
+    return jobs
+
+
+def main() -> int:
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Precompute job-to-candidate matches for open jobs")
+    parser.add_argument('--jobs', default=None, help="JSON array or JSON Lines file of open jobs to add or update")
+    parser.add_argument('--close', nargs='*', default=[], help="Job ids that are no longer open")
+    parser.add_argument('--full', action='store_true', help="Score every job against every candidate")
+    parser.add_argument('--top-k', type=int, default=config.JOB_MATCH_TOP_K, help="Matches stored per job")
+    parser.add_argument('--chunk-size', type=int, default=config.JOB_MATCH_CHUNK_SIZE, help="Candidates scored per matrix multiply")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs) if args.jobs else []
+    if args.jobs:
+        logger.info(f"Loaded {len(jobs)} jobs from {args.jobs}")
+
+    matcher = JobMatcher(
+        cosmosdb=CosmosDB(config=config),
+        embedding_service=AzureAIEmbedding(config=config),
+        store=MatchStore(db_path=config.JOB_MATCH_STORE_PATH),
+        top_k=args.top_k,
+        chunk_size=args.chunk_size
+    )
+    stats = asyncio.run(matcher.refresh(jobs=jobs, closed_job_ids=args.close, full=args.full))
+    logger.info(
+        f"Refreshed {stats['jobs']} open jobs ({stats.get('full', 0)} full, {stats.get('incremental', 0)} incremental) "
+        f"in {stats['seconds']}s"
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import os
+import shutil
+
+# Production serving mode: each worker process owns one long-lived event loop
+# (see src/common/event_loop.py), and request threads hand coroutines to it.
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 180))
+keepalive = 5
+
+
+# With PROMETHEUS_MULTIPROC_DIR set, /metrics aggregates every worker's samples
+# from that directory; start it empty and drop the files of exited workers.
+def on_starting(server):
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from src.common.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
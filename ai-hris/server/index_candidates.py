@@ -0,0 +1,76 @@
+"""Bulk-index candidates into the Cosmos DB vector container.
+
+Usage:
+    python index_candidates.py --input candidates.jsonl --checkpoint .cache/index.checkpoint
+
+The input is a JSON array or JSON Lines file of objects matching CandidateData.
+Re-running with the same checkpoint file skips candidates that were already indexed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from loguru import logger
+from pydantic import ValidationError
+
+from src.config.env import AppConfig
+from src.domain.candidate_recommendation import CandidateData
+from src.repository.checkpoint import IndexingCheckpoint
+from src.repository.database import CosmosDB
+from src.repository.embedding import AzureAIEmbedding
+from src.usecase.candidate_recommendation import CandidateRecommendation
+
+
+def read_records(path: str) -> list:
+    """Records of a JSON array or JSON Lines file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    if content.startswith('['):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def load_candidates(path: str) -> list[dict]:
+    candidates = []
+    for index, record in enumerate(read_records(path)):
+        try:
+            candidates.append(CandidateData(**record).model_dump())
+        except ValidationError as ve:
+            logger.warning(f"Skipping invalid candidate at line/index {index}: {ve}")
+    return candidates
+
+
+def main() -> int:
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Bulk-index candidates with batched embeddings")
+    parser.add_argument('--input', required=True, help="JSON array or JSON Lines file of candidates")
+    parser.add_argument('--batch-size', type=int, default=config.INDEXING_BATCH_SIZE, help="Candidates per embedding request")
+    parser.add_argument('--concurrency', type=int, default=config.INDEXING_CONCURRENCY, help="Concurrent Cosmos DB writes")
+    parser.add_argument('--checkpoint', default=None, help="Checkpoint file used to resume an interrupted run")
+    args = parser.parse_args()
+
+    candidates = load_candidates(args.input)
+    logger.info(f"Loaded {len(candidates)} candidates from {args.input}")
+
+    candidate_recommendation = CandidateRecommendation(
+        cosmosdb=CosmosDB(config=config),
+        embedding_service=AzureAIEmbedding(config=config)
+    )
+    checkpoint = IndexingCheckpoint(args.checkpoint) if args.checkpoint else None
+
+    summary = asyncio.run(candidate_recommendation.bulk_indexing(
+        candidates=candidates,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        checkpoint=checkpoint
+    ))
+
+    logger.info(f"Indexed {summary['indexed']}, skipped {summary['skipped']}, failed {summary['failed']} of {summary['total']}")
+    for error in summary['errors']:
+        logger.error(f"{error['candidate_id']}: {error['error']}")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
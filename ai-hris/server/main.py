@@ -1,38 +1,206 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from datetime import datetime
+import multiprocessing
 import os
-from src.usecase.cv_extractor import CVExtractor
+import json
+import time
+from src.usecase.cv_extractor import CVExtractor, cv_extraction_version
+from src.usecase.document_text import DocumentTextExtractor, char_budget
 from src.config.env import AppConfig
 from src.llm.llm_sk import LLMService
-import asyncio
-from src.domain.http_response import ok, bad_request_error, internal_server_error
-from src.common.const import AssessmentType
-from src.usecase.cv_scoring import CVScoring
-from src.usecase.candidate_recommendation import CandidateRecommendation
+from src.common.provider import ClientProvider
+from src.domain.http_response import ok, response as http_response, bad_request_error, not_found_error, internal_server_error
+from src.common.const import AssessmentType, ResponseStatus
+from src.common.event_loop import run_async, iterate_async
+from src.common.job_queue import JobQueue, JobQueueFullError
+from src.common.metrics import HTTP_REQUEST_DURATION, current_endpoint, render_metrics
+from src.usecase.cv_scoring import CVScoring, rubric_error
+from src.usecase.candidate_recommendation import CandidateRecommendation, RecommendationCursorError, RECOMMENDATION_FIELDS
 from src.repository.database import CosmosDB
 from src.repository.embedding import AzureAIEmbedding
+from src.repository.cv_cache import CVExtractionCache
+from src.repository.score_store import ScoreStore
+from src.repository.vector_index import CosmosVectorBackend, LocalVectorIndex
+from src.repository.browser_pool import BrowserPool
+from src.repository.background_check_cache import BackgroundCheckCache
+from src.repository.job_store import JobStore, SUCCEEDED, FAILED
+from src.repository.match_store import MatchStore
+from src.repository.recommendation_sessions import RecommendationSessionStore
+from src.llm.sentiment import SentimentClassifier
+from src.usecase.background_checking import BackgroundChecker
+from src.usecase.job_matching import JobMatcher
 from src.domain.candidate_recommendation import CandidateData, JobData
 from pydantic import ValidationError
+from werkzeug.exceptions import RequestEntityTooLarge
 
 app = Flask(__name__)
 
 config = AppConfig()
+# Rejects oversized bodies while they are parsed, before upload limits are checked per file.
+app.config['MAX_CONTENT_LENGTH'] = config.MAX_REQUEST_SIZE or None
 
-cosmosdb = CosmosDB(config=config)
-azembedding = AzureAIEmbedding(config=config)
+clients = ClientProvider()
 
-llm = LLMService(
-    service_id="eyds-hris-ai",
-    azure_openai_deployment=config.AZURE_OPENAI_DEPLOYMENT_NAME,
-    azure_openai_endpoint=config.AZURE_OPENAI_API_BASE,
-    
-    azure_openai_version=config.AZURE_OPENAI_API_VERSION,
-    azure_openai_key=config.AZURE_OPENAI_API_KEY
-)
+def _build_llm():
+    return LLMService(
+        service_id="eyds-hris-ai",
+        azure_openai_deployment=config.AZURE_OPENAI_DEPLOYMENT_NAME,
+        azure_openai_endpoint=config.AZURE_OPENAI_API_BASE,
+        azure_openai_version=config.AZURE_OPENAI_API_VERSION,
+        azure_openai_key=config.AZURE_OPENAI_API_KEY
+    )
+
+def _build_cv_extractor():
+    cv_cache = CVExtractionCache(
+        db_path=config.CV_CACHE_PATH,
+        version=cv_extraction_version(),
+        memory_size=config.CV_CACHE_MEMORY_SIZE,
+        max_entries=config.CV_CACHE_MAX_ENTRIES
+    ) if config.CV_CACHE_ENABLED else None
+
+    document_text_extractor = DocumentTextExtractor(
+        max_workers=config.CV_PARSER_PROCESSES or None,
+        pages_per_task=config.CV_PARSER_PAGES_PER_TASK,
+        max_pages=config.CV_PARSER_MAX_PAGES,
+        timeout_seconds=config.CV_PARSER_TIMEOUT_SECONDS
+    )
+
+    return CVExtractor(
+        llm_service=clients.llm,
+        cache=cv_cache,
+        text_extractor=document_text_extractor,
+        max_chars=char_budget(config.CV_TEXT_MAX_CHARS, config.CV_TEXT_MAX_TOKENS)
+    )
+
+def _build_vector_backend():
+    if config.VECTOR_BACKEND == 'local':
+        vector_backend = LocalVectorIndex(
+            path=config.VECTOR_INDEX_PATH,
+            nprobe=config.VECTOR_INDEX_NPROBE,
+            nlist=config.VECTOR_INDEX_NLIST,
+            reload_interval_seconds=config.VECTOR_INDEX_RELOAD_SECONDS
+        )
+        # Only one worker builds a missing snapshot; the others load it.
+        if vector_backend.load_or_build(clients.cosmosdb.iter_embeddings):
+            app.logger.warning(f"No vector index snapshot was found at {config.VECTOR_INDEX_PATH}, built it from Cosmos DB")
+        return vector_backend
+    return CosmosVectorBackend(clients.cosmosdb)
+
+def _build_candidate_recommendation():
+    return CandidateRecommendation(
+        cosmosdb=clients.cosmosdb,
+        embedding_service=clients.azembedding,
+        vector_backend=clients.vector_backend,
+        rerank_alpha=config.RECOMMEND_RERANK_ALPHA,
+        page_window=config.RECOMMEND_PAGE_WINDOW,
+        max_window=config.RECOMMEND_MAX_TOP_K,
+        session_store=RecommendationSessionStore(
+            db_path=config.RECOMMEND_SESSION_STORE_PATH,
+            ttl_seconds=config.RECOMMEND_SESSION_TTL_SECONDS
+        ),
+        match_store=clients.match_store
+    )
+
+def _build_job_matcher():
+    return JobMatcher(
+        cosmosdb=clients.cosmosdb,
+        embedding_service=clients.azembedding,
+        store=clients.match_store,
+        top_k=config.JOB_MATCH_TOP_K,
+        chunk_size=config.JOB_MATCH_CHUNK_SIZE
+    )
+
+def _build_sentiment_classifier():
+    from openai import AsyncAzureOpenAI
 
-cv_scoring = CVScoring(llm_service=llm)
-cv_extractor = CVExtractor(llm_service=llm)
-candidate_recommendation = CandidateRecommendation(cosmosdb=cosmosdb, embedding_service=azembedding)
+    return SentimentClassifier(
+        client=AsyncAzureOpenAI(
+            api_key=config.AZURE_OPENAI_API_KEY,
+            api_version=config.SENTIMENT_API_VERSION,
+            azure_endpoint=config.AZURE_OPENAI_API_BASE
+        ),
+        deployment=config.SENTIMENT_DEPLOYMENT_NAME,
+        max_batch_tokens=config.SENTIMENT_BATCH_MAX_TOKENS
+    )
+
+def _build_background_checker():
+    return BackgroundChecker(
+        pool=BrowserPool(
+            size=config.BROWSER_POOL_SIZE,
+            max_contexts_per_browser=config.BROWSER_MAX_CONTEXTS_PER_BROWSER,
+            max_pages_per_browser=config.BROWSER_MAX_PAGES_PER_BROWSER,
+            headless=config.BROWSER_HEADLESS
+        ),
+        classifier=clients.sentiment_classifier,
+        cache=BackgroundCheckCache(db_path=config.BACKGROUND_CHECK_CACHE_PATH) if config.BACKGROUND_CHECK_CACHE_ENABLED else None,
+        ttl_seconds=config.BACKGROUND_CHECK_CACHE_TTL_SECONDS,
+        stale_seconds=config.BACKGROUND_CHECK_CACHE_STALE_SECONDS,
+        tweets_per_profile=config.BACKGROUND_CHECK_TWEETS
+    )
+
+def _build_background_check_jobs():
+    return JobQueue(
+        store=JobStore(db_path=config.JOB_STORE_PATH),
+        job_type=AssessmentType.OnlineBackgroundCheck.value,
+        handler=lambda payload: clients.background_checker.run(**payload),
+        workers=config.BACKGROUND_CHECK_WORKERS,
+        max_pending=config.BACKGROUND_CHECK_MAX_PENDING,
+        timeout_seconds=config.BACKGROUND_CHECK_TIMEOUT_SECONDS
+    )
+
+# Clients are built on first use (or by the warm-up below), so importing this
+# module neither loads the heavy SDKs nor needs Cosmos DB/Azure OpenAI to be reachable.
+clients.register("cosmosdb", lambda: CosmosDB(config=config))
+clients.register("azembedding", lambda: AzureAIEmbedding(config=config))
+clients.register("llm", _build_llm)
+clients.register("cv_scoring", lambda: CVScoring(llm_service=clients.llm, score_store=ScoreStore(db_path=config.SCORE_STORE_PATH)))
+clients.register("cv_extractor", _build_cv_extractor)
+clients.register("vector_backend", _build_vector_backend)
+clients.register("match_store", lambda: MatchStore(db_path=config.JOB_MATCH_STORE_PATH))
+clients.register("candidate_recommendation", _build_candidate_recommendation)
+clients.register("job_matcher", _build_job_matcher)
+clients.register("sentiment_classifier", _build_sentiment_classifier)
+clients.register("background_checker", _build_background_checker)
+clients.register("background_check_jobs", _build_background_check_jobs)
+
+# Document parser workers re-import this module when started with `python main.py`.
+if config.WARM_UP_ON_START and multiprocessing.parent_process() is None:
+    clients.warm_up_in_background()
+
+def request_too_large():
+    return http_response(ResponseStatus.Error, f"Request body exceeds the maximum of {config.MAX_REQUEST_SIZE} bytes", 413)
+
+@app.errorhandler(RequestEntityTooLarge)
+def handle_request_too_large(e):
+    return request_too_large()
+
+@app.before_request
+def start_request_metrics():
+    # Route templates rather than raw paths keep label cardinality bounded.
+    g.metrics_endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    g.metrics_started = time.perf_counter()
+    current_endpoint.set(g.metrics_endpoint)
+
+@app.after_request
+def record_request_metrics(resp):
+    started = g.get('metrics_started')
+    if started is not None:
+        HTTP_REQUEST_DURATION.labels(g.metrics_endpoint, request.method, str(resp.status_code)).observe(
+            time.perf_counter() - started
+        )
+    return resp
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    data, content_type = render_metrics()
+    return Response(data, content_type=content_type)
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    status = clients.status
+    if not status['ready']:
+        return http_response(ResponseStatus.Error, "Service is warming up", 503, status)
+    return http_response(ResponseStatus.Success, "Service is ready", 200, status)
 
 @app.route('/ping', methods=['GET'])
 def ping():
@@ -61,13 +229,128 @@ def candidate_assessment():
 
         if not candidate_data:
             return bad_request_error("candidate_data is required")
+
+        if assessment_type == AssessmentType.OnlineBackgroundCheck:
+            profile_data = candidate_data if isinstance(candidate_data, dict) else {}
+            linkedin_url = data.get('linkedin_url') or profile_data.get('linkedin_url')
+            x_username = data.get('x_username') or profile_data.get('x_username')
+            if not linkedin_url and not x_username:
+                return bad_request_error("linkedin_url or x_username is required for online background check")
+
+            try:
+                job_id = run_async(clients.background_check_jobs.submit({
+                    "linkedin_url": linkedin_url,
+                    "x_username": x_username,
+                    "force_refresh": bool(data.get('force_refresh', False))
+                }))
+            except JobQueueFullError as qe:
+                return http_response(ResponseStatus.Error, str(qe), 503)
+
+            return http_response(
+                ResponseStatus.Success,
+                "Online background check accepted",
+                202,
+                {"job_id": job_id, "status": "queued", "status_url": f"/api/v1/hr/candidate/assessment/jobs/{job_id}"}
+            )
         
-        response = asyncio.run(cv_scoring.assess(predefined_score=predefined_score, candidate_data=candidate_data))
+        result = run_async(clients.cv_scoring.assess(predefined_score=predefined_score, candidate_data=candidate_data, candidate_id=candidate_id))
         
-        return ok(message="Candidate assessment processed successfully", data=response)
+        return ok(message="Candidate assessment processed successfully", data=result)
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@app.route('/api/v1/hr/candidate/assessment/jobs/<job_id>', methods=['GET'])
+def candidate_assessment_job_status(job_id):
+    try:
+        job = clients.background_check_jobs.store.get(job_id)
+        if job is None:
+            return not_found_error(f"Job {job_id} not found")
+
+        job.pop('result')
+        return ok(message="Job status retrieved successfully", data=job)
+
+    except Exception as e:
+        app.logger.exception("Error in candidate_assessment_job_status route")
+        return internal_server_error(str(e))
+
+@app.route('/api/v1/hr/candidate/assessment/jobs/<job_id>/result', methods=['GET'])
+def candidate_assessment_job_result(job_id):
+    try:
+        job = clients.background_check_jobs.store.get(job_id)
+        if job is None:
+            return not_found_error(f"Job {job_id} not found")
+
+        if job['status'] == FAILED:
+            return internal_server_error(f"Job {job_id} failed: {job['error']}")
+
+        if job['status'] != SUCCEEDED:
+            return http_response(ResponseStatus.Success, f"Job {job_id} is {job['status']}", 202, {"job_id": job_id, "status": job['status']})
+
+        return ok(message="Online background check completed", data=job['result'])
+
+    except Exception as e:
+        app.logger.exception("Error in candidate_assessment_job_result route")
+        return internal_server_error(str(e))
+
+@app.route('/api/v1/hr/candidate/assessment/batch', methods=['POST'])
+def candidate_assessment_batch():
+    try:
+        data = request.get_json()
+        predefined_score = data.get('predefined_score')
+        candidates = data.get('candidates')
+
+        if not predefined_score:
+            return bad_request_error("predefined_score is required")
+
+        if not candidates or not isinstance(candidates, list):
+            return bad_request_error("candidates must be a non-empty list")
+
+        if len(candidates) > config.CV_SCORING_BATCH_MAX_CANDIDATES:
+            return bad_request_error(f"Too many candidates: maximum is {config.CV_SCORING_BATCH_MAX_CANDIDATES}")
+
+        if any(not isinstance(candidate, dict) or not candidate.get('candidate_data') for candidate in candidates):
+            return bad_request_error("candidate_data is required for every candidate")
+
+        response = run_async(clients.cv_scoring.assess_batch(
+            predefined_score=predefined_score,
+            candidates=candidates,
+            concurrency=config.CV_SCORING_CONCURRENCY
+        ))
+
+        return ok(message="Batch candidate assessment processed successfully", data=response)
+
+    except Exception as e:
+        app.logger.exception("Error in candidate_assessment_batch route")
+        return internal_server_error(str(e))
+
+@app.route('/api/v1/hr/candidate/assessment/rescore', methods=['POST'])
+def candidate_assessment_rescore():
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return bad_request_error("Request body must be a JSON object")
+
+        predefined_score = data.get('predefined_score')
+        candidate_ids = data.get('candidate_ids')
+
+        rubric_problem = rubric_error(predefined_score)
+        if rubric_problem:
+            return bad_request_error(rubric_problem)
+
+        if candidate_ids is not None and (
+            not isinstance(candidate_ids, list)
+            or any(isinstance(candidate_id, bool) or not isinstance(candidate_id, (str, int)) for candidate_id in candidate_ids)
+        ):
+            return bad_request_error("candidate_ids must be a list of ids")
+
+        response = clients.cv_scoring.rescore(predefined_score=predefined_score, candidate_ids=candidate_ids)
+
+        return ok(message="Candidate scores recalculated successfully", data=response)
+
+    except Exception as e:
+        app.logger.exception("Error in candidate_assessment_rescore route")
+        return internal_server_error(str(e))
     
 @app.route('/api/v1/hr/resume-parser/file', methods=['POST'])
 def resume_parser_file():
@@ -83,7 +366,7 @@ def resume_parser_file():
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({'error': 'Only PDF files are allowed'}), 400
         
-        response = asyncio.run(cv_extractor.extract(pdf_bytes=file.read(), pdf_file_path=file.filename))
+        response = run_async(clients.cv_extractor.extract(pdf_bytes=file.read(), pdf_file_path=file.filename))
         
         return ok(message="CV data structured successfully", data=response)
             
@@ -100,7 +383,7 @@ def resume_parser_base64():
         if not resume:
             return jsonify({'error': 'resume is required'}), 400
 
-        response = asyncio.run(cv_extractor.extract(base64_cv=resume))
+        response = run_async(clients.cv_extractor.extract(base64_cv=resume))
         
         return ok(message="CV data structured successfully", data=response)
 
@@ -108,25 +391,159 @@ def resume_parser_base64():
         return internal_server_error(str(e))
 
 
+@app.route('/api/v1/hr/resume-parser/file/stream', methods=['POST'])
+def resume_parser_file_stream():
+    try:
+        if 'resume' not in request.files:
+            return bad_request_error("No resume file provided")
+
+        file = request.files['resume']
+
+        if file.filename == '':
+            return bad_request_error("No file selected")
+
+        if not file.filename.lower().endswith('.pdf'):
+            return bad_request_error("Only PDF files are allowed")
+
+        pdf_bytes = file.read()
+        filename = file.filename
+
+        def generate():
+            try:
+                for event in iterate_async(clients.cv_extractor.extract_stream(pdf_bytes=pdf_bytes, pdf_file_path=filename)):
+                    name = event.pop("event")
+                    yield f"event: {name}\ndata: {json.dumps(event)}\n\n"
+            except Exception as e:
+                app.logger.exception("Error in resume_parser_file_stream route")
+                yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+
+        return Response(
+            generate(),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    except Exception as e:
+        app.logger.exception("Error in resume_parser_file_stream route")
+        return internal_server_error(str(e))
+
+@app.route('/api/v1/hr/resume-parser/bulk', methods=['POST'])
+def resume_parser_bulk():
+    try:
+        uploads = request.files.getlist('resumes')
+        uploads = [file for file in uploads if file.filename]
+        if not uploads:
+            return bad_request_error("No resume files provided")
+
+        concurrency = request.form.get('concurrency', type=int) or config.CV_BULK_CONCURRENCY
+        concurrency = max(1, min(concurrency, config.CV_BULK_MAX_CONCURRENCY))
+
+        try:
+            files = clients.cv_extractor.unpack_files(
+                # Upload streams are spooled by Werkzeug; unpack_files reads only what passes its limits.
+                files=[(file.filename, file.stream) for file in uploads],
+                max_files=config.CV_BULK_MAX_FILES,
+                max_file_size=config.CV_BULK_MAX_FILE_SIZE
+            )
+        except ValueError as ve:
+            return bad_request_error(str(ve))
+
+        if not files:
+            return bad_request_error("No PDF, DOCX, or DOC files found in the upload")
+
+        def generate():
+            succeeded = 0
+            for item in iterate_async(clients.cv_extractor.extract_bulk(files=files, concurrency=concurrency)):
+                if item['error'] is None:
+                    succeeded += 1
+                yield json.dumps({"type": "result", **item}) + "\n"
+            yield json.dumps({
+                "type": "summary",
+                "total": len(files),
+                "succeeded": succeeded,
+                "failed": len(files) - succeeded
+            }) + "\n"
+
+        return Response(generate(), mimetype='application/x-ndjson')
+
+    except RequestEntityTooLarge:
+        return request_too_large()
+    except Exception as e:
+        app.logger.exception("Error in resume_parser_bulk route")
+        return internal_server_error(str(e))
+
+
 @app.route('/api/v1/hr/candidate/recommend', methods=['POST'])
 def recommend_candidates_from_job():
     try:
         data = request.get_json()
-        job_data = data.get("job")
-        if not job_data:
-            return bad_request_error("job is required")
+        cursor = data.get("cursor")
+        # Responses stay a plain list unless the caller asks for paging or projection.
+        paginated = any(key in data for key in ("cursor", "offset", "fields"))
+
+        if cursor and "offset" in data:
+            return bad_request_error("offset cannot be combined with cursor; the cursor already encodes the position")
+
+        job_dict = None
+        if not cursor:
+            job_data = data.get("job")
+            if not job_data:
+                return bad_request_error("job is required")
+
+            try:
+                validated_job_data = JobData(**job_data)
+            except ValidationError as ve:
+                error_messages = []
+                for error in ve.errors():
+                    error_messages.append(f"{error['loc'][0]}: {error['msg']}")
+                return bad_request_error(f"Invalid job data: {', '.join(error_messages)}")
+            job_dict = validated_job_data.model_dump()
+
+        mode = data.get("mode", config.RECOMMEND_MODE)
+        if mode not in ("vector", "two_stage"):
+            return bad_request_error(f"Invalid mode: {mode}")
 
         try:
-            validated_job_data = JobData(**job_data)
-        except ValidationError as ve:
-            error_messages = []
-            for error in ve.errors():
-                error_messages.append(f"{error['loc'][0]}: {error['msg']}")
-            return bad_request_error(f"Invalid job data: {', '.join(error_messages)}")
+            num_results = int(data.get("num_results", config.RECOMMEND_NUM_RESULTS))
+            top_k = int(data.get("top_k", config.RECOMMEND_TOP_K))
+            offset = int(data.get("offset", 0))
+        except (TypeError, ValueError):
+            return bad_request_error("num_results, top_k and offset must be integers")
+
+        if not 1 <= num_results <= config.RECOMMEND_MAX_RESULTS:
+            return bad_request_error(f"num_results must be between 1 and {config.RECOMMEND_MAX_RESULTS}")
+        if mode == "two_stage" and not num_results <= top_k <= config.RECOMMEND_MAX_TOP_K:
+            return bad_request_error(f"top_k must be between num_results and {config.RECOMMEND_MAX_TOP_K}")
+        if not 0 <= offset < config.RECOMMEND_MAX_TOP_K:
+            return bad_request_error(f"offset must be between 0 and {config.RECOMMEND_MAX_TOP_K - 1}")
+
+        fields = data.get("fields")
+        if fields is not None:
+            if not isinstance(fields, list) or not fields:
+                return bad_request_error("fields must be a non-empty list")
+            unknown = [field for field in fields if field not in RECOMMENDATION_FIELDS]
+            if unknown:
+                return bad_request_error(f"Unknown fields: {', '.join(map(str, unknown))}")
+
+        if not paginated:
+            results = run_async(clients.candidate_recommendation.recommend(
+                job_detail=job_dict,
+                num_results=num_results,
+                top_k=top_k if mode == "two_stage" else None
+            ))
+        else:
+            try:
+                results = run_async(clients.candidate_recommendation.recommend_page(
+                    job_detail=job_dict,
+                    num_results=num_results,
+                    offset=offset,
+                    cursor=cursor,
+                    top_k=top_k if mode == "two_stage" else None,
+                    fields=fields
+                ))
+            except RecommendationCursorError as ce:
+                return bad_request_error(str(ce))
 
-        job_dict = validated_job_data.model_dump()
-        results = asyncio.run(candidate_recommendation.recommend(job_detail=job_dict))
-        
         return ok(
             message="Candidate recommendations generated successfully",
             data=results
@@ -135,7 +552,58 @@ def recommend_candidates_from_job():
     except Exception as e:
         app.logger.exception("Error in recommend_candidates_from_job route")
         return internal_server_error(str(e))
-    
+
+@app.route('/api/v1/hr/job/matches/refresh', methods=['POST'])
+def refresh_job_matches():
+    try:
+        data = request.get_json(silent=True) or {}
+        jobs = data.get("jobs") or []
+        closed_job_ids = data.get("closed_job_ids") or []
+        if not isinstance(jobs, list) or not isinstance(closed_job_ids, list):
+            return bad_request_error("jobs and closed_job_ids must be lists")
+
+        if len(jobs) > config.JOB_MATCH_MAX_JOBS:
+            return bad_request_error(f"Too many jobs: maximum is {config.JOB_MATCH_MAX_JOBS}")
+
+        validated_jobs = []
+        for index, job_data in enumerate(jobs):
+            try:
+                validated_job = JobData(**job_data)
+            except (ValidationError, TypeError) as ve:
+                return bad_request_error(f"Invalid job data at index {index}: {str(ve)}")
+            if not validated_job.job_id:
+                return bad_request_error(f"job_id is required for the job at index {index}")
+            validated_jobs.append(validated_job.model_dump())
+
+        result = run_async(clients.job_matcher.refresh(
+            jobs=validated_jobs,
+            closed_job_ids=closed_job_ids,
+            full=bool(data.get("full", False))
+        ))
+
+        return ok(message="Job matches refreshed successfully", data=result)
+
+    except Exception as e:
+        app.logger.exception("Error in refresh_job_matches route")
+        return internal_server_error(str(e))
+
+@app.route('/api/v1/hr/job/<job_id>/matches', methods=['GET'])
+def get_job_matches(job_id):
+    try:
+        num_results = request.args.get('num_results', type=int)
+        if num_results is not None and num_results < 1:
+            return bad_request_error("num_results must be a positive integer")
+
+        result = clients.job_matcher.get_matches(job_id, num_results=num_results)
+        if result is None:
+            return not_found_error(f"No precomputed matches for job {job_id}")
+
+        return ok(message="Job matches retrieved successfully", data=result)
+
+    except Exception as e:
+        app.logger.exception("Error in get_job_matches route")
+        return internal_server_error(str(e))
+
 @app.route('/api/v1/hr/candidate/insert', methods=['POST'])
 def insert_candidate():
     try:
@@ -154,7 +622,7 @@ def insert_candidate():
 
         candidate_dict = validated_candidate.model_dump()
         
-        result = asyncio.run(candidate_recommendation.indexing(candidate_data=candidate_dict))
+        result = run_async(clients.candidate_recommendation.indexing(candidate_data=candidate_dict))
 
         return ok(
             message="Candidate indexed successfully",
@@ -165,6 +633,39 @@ def insert_candidate():
         app.logger.exception("Error in insert_candidate route")
         return internal_server_error(str(e))
 
+@app.route('/api/v1/hr/candidate/insert/bulk', methods=['POST'])
+def insert_candidates_bulk():
+    try:
+        data = request.get_json()
+        candidates = data.get("candidates")
+        if not candidates or not isinstance(candidates, list):
+            return bad_request_error("candidates must be a non-empty list")
+
+        if len(candidates) > config.INDEXING_MAX_CANDIDATES:
+            return bad_request_error(f"Too many candidates: maximum is {config.INDEXING_MAX_CANDIDATES}")
+
+        validated_candidates = []
+        for index, candidate_data in enumerate(candidates):
+            try:
+                validated_candidates.append(CandidateData(**candidate_data).model_dump())
+            except (ValidationError, TypeError) as ve:
+                return bad_request_error(f"Invalid candidate data at index {index}: {str(ve)}")
+
+        result = run_async(clients.candidate_recommendation.bulk_indexing(
+            candidates=validated_candidates,
+            batch_size=config.INDEXING_BATCH_SIZE,
+            concurrency=config.INDEXING_CONCURRENCY
+        ))
+
+        return ok(
+            message="Candidates indexed successfully",
+            data=result
+        )
+
+    except Exception as e:
+        app.logger.exception("Error in insert_candidates_bulk route")
+        return internal_server_error(str(e))
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8000))
     app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""Convert stored candidate embeddings to the configured storage format.
+
+Usage:
+    python migrate_embeddings.py [--format int8] [--dimensions 256] [--source-container old-candidates]
+
+Documents are rewritten in EMBEDDING_STORAGE_FORMAT (float32 or int8). With
+--dimensions, embeddings are shortened and re-normalized, which is only valid
+for text-embedding-3 models. Cosmos DB vector policies cannot be changed in
+place, so when the format or dimensions change, create a container whose vector
+policy matches and copy into it with --source-container. Re-running with the
+same checkpoint file skips documents that were already migrated.
+
+Each migrated document's contentHash is recomputed for the new format and
+dimensions, so re-indexing afterwards does not re-embed unchanged candidates.
+Set EMBEDDING_DIMENSIONS and EMBEDDING_STORAGE_FORMAT to the migrated values
+before indexing again.
+"""
+import argparse
+import sys
+
+from loguru import logger
+
+from src.common.quantization import EMBEDDING_FORMATS, truncate_embedding
+from src.config.env import AppConfig
+from src.repository.checkpoint import IndexingCheckpoint
+from src.repository.database import CosmosDB
+from src.usecase.candidate_recommendation import candidate_content_hash
+
+_SYSTEM_FIELDS = ('_rid', '_self', '_etag', '_attachments', '_ts')
+
+
+def document_content_hash(document: dict, embedding_model: str, dimensions: int, storage_format: str) -> str:
+    """The content hash indexing would compute for the candidate stored in ``document``"""
+    candidate_data = {
+        'candidate_name': document.get('name'),
+        'candidate_skills': document.get('skills'),
+        'candidate_work_history': document.get('workHistory'),
+        'candidate_education_history': document.get('educationHistory'),
+    }
+    return candidate_content_hash(candidate_data, embedding_model, dimensions=dimensions, storage_format=storage_format)
+
+
+def main() -> int:
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Re-encode stored candidate embeddings")
+    parser.add_argument('--format', choices=EMBEDDING_FORMATS, default=config.EMBEDDING_STORAGE_FORMAT, help="Target storage format")
+    parser.add_argument('--dimensions', type=int, default=config.EMBEDDING_DIMENSIONS, help="Shorten embeddings to this size (0 = keep)")
+    parser.add_argument('--source-container', default=None, help="Copy from this container instead of rewriting in place")
+    parser.add_argument('--checkpoint', default=None, help="Checkpoint file used to resume an interrupted run")
+    args = parser.parse_args()
+
+    if args.dimensions and 'text-embedding-3' not in config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME:
+        logger.warning("Shortening embeddings is only meaningful for text-embedding-3 models")
+
+    config.EMBEDDING_STORAGE_FORMAT = args.format
+    cosmosdb = CosmosDB(config=config)
+    checkpoint = IndexingCheckpoint(args.checkpoint) if args.checkpoint else None
+
+    migrated, skipped, failed = 0, 0, 0
+    for document in cosmosdb.iter_documents(args.source_container):
+        if checkpoint is not None and checkpoint.is_done(document['id']):
+            skipped += 1
+            continue
+        if not document.get('embeddings'):
+            skipped += 1
+            continue
+
+        vector = cosmosdb.decode_embedding(document)
+        already_migrated = (
+            args.source_container is None
+            and document.get('embeddingFormat') == args.format
+            and (not args.dimensions or len(vector) == args.dimensions)
+        )
+        if already_migrated:
+            skipped += 1
+            continue
+
+        try:
+            document = {key: value for key, value in document.items() if key not in _SYSTEM_FIELDS}
+            document.pop('embeddingScale', None)
+            document.update(cosmosdb.encode_embedding(truncate_embedding(vector, args.dimensions)))
+            document['contentHash'] = document_content_hash(
+                document,
+                config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME,
+                dimensions=args.dimensions,
+                storage_format=args.format
+            )
+            cosmosdb.container.upsert_item(body=document)
+            migrated += 1
+            if checkpoint is not None:
+                checkpoint.mark_done([document['id']])
+        except Exception as e:
+            logger.error(f"Failed to migrate document {document['id']}: {e}")
+            failed += 1
+
+        if migrated and migrated % 500 == 0:
+            logger.info(f"Migrated {migrated} documents")
+
+    logger.info(f"Migrated {migrated}, skipped {skipped}, failed {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
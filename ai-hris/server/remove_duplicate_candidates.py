@@ -0,0 +1,47 @@
+"""Remove legacy duplicate candidate documents from Cosmos DB.
+
+Usage:
+    python remove_duplicate_candidates.py [--dry-run]
+
+Candidates used to be written with random document ids, so re-indexing one
+left an extra document behind. Documents are now upserted under an id derived
+from candidateId; this deletes the older documents of every candidate that
+already has one. Run it once after upgrading; indexing no longer cleans up
+duplicates itself.
+"""
+import argparse
+import sys
+
+from loguru import logger
+
+from src.config.env import AppConfig
+from src.repository.database import CosmosDB
+
+
+def main() -> int:
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description="Delete legacy duplicate candidate documents")
+    parser.add_argument('--dry-run', action='store_true', help="Only list the documents that would be deleted")
+    args = parser.parse_args()
+
+    cosmosdb = CosmosDB(config=config)
+    removed, failed = 0, 0
+    for document_id, candidate_id, partition_key in cosmosdb.iter_duplicate_documents():
+        if args.dry_run:
+            logger.info(f"Would remove duplicate document {document_id} for candidate {candidate_id}")
+            removed += 1
+            continue
+        try:
+            cosmosdb.container.delete_item(item=document_id, partition_key=partition_key)
+            logger.info(f"Removed duplicate document {document_id} for candidate {candidate_id}")
+            removed += 1
+        except Exception as e:
+            logger.error(f"Failed to remove document {document_id}: {e}")
+            failed += 1
+
+    logger.info(f"{'Found' if args.dry_run else 'Removed'} {removed} duplicate documents, failed {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
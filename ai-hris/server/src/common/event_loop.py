@@ -0,0 +1,117 @@
+import asyncio
+import os
+import threading
+from typing import Any, AsyncIterable, Coroutine, Iterator, Optional, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+class BackgroundEventLoop:
+    """A long-lived asyncio event loop running on a daemon thread.
+
+    Sync Flask handlers submit coroutines here instead of calling ``asyncio.run``
+    per request, so the async Azure OpenAI / embedding clients keep their HTTP
+    connection pools alive between requests. One loop is started lazily per
+    process, which makes it safe to use under pre-forking servers like gunicorn.
+    """
+
+    def __init__(self, name: str = "hris-event-loop"):
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def _is_running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def _start(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run, name=self._name, daemon=True)
+        thread.start()
+        ready.wait()
+
+        self._loop = loop
+        self._thread = thread
+        self._pid = os.getpid()
+        logger.info(f"Started background event loop '{self._name}' in process {self._pid}")
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if not self._is_running():
+            with self._lock:
+                if not self._is_running():
+                    self._start()
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the background loop and block until it finishes."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, aiterable: AsyncIterable[T]) -> Iterator[T]:
+        """Drive an async iterable on the background loop from sync code.
+
+        Used to stream results (e.g. Flask streaming responses) as they are
+        produced instead of waiting for the whole coroutine.
+        """
+        iterator = aiterable.__aiter__()
+
+        async def _next():
+            return await iterator.__anext__()
+
+        try:
+            while True:
+                try:
+                    yield self.run(_next())
+                except StopAsyncIteration:
+                    return
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                self.run(aclose())
+
+    def stop(self):
+        with self._lock:
+            if not self._is_running():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+            self._pid = None
+
+
+_default_loop = BackgroundEventLoop()
+
+
+def get_event_loop() -> BackgroundEventLoop:
+    return _default_loop
+
+
+def run_async(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine on the shared per-process event loop."""
+    return _default_loop.run(coro, timeout)
+
+
+def iterate_async(aiterable: AsyncIterable[T]) -> Iterator[T]:
+    """Iterate an async iterable on the shared per-process event loop."""
+    return _default_loop.iterate(aiterable)
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from loguru import logger
+
+from src.common.metrics import current_endpoint
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+class JobQueue:
+    """Bounded asyncio job queue drained by a fixed number of worker tasks.
+
+    The queue and its workers are created lazily on the event loop of the first
+    ``submit`` (the shared background loop in the server), so one set of
+    workers runs per process. Job status is written to ``store`` as it moves
+    from queued to running to succeeded or failed.
+    """
+
+    def __init__(self, store, job_type: str, handler: Callable[[dict], Awaitable[Any]], workers: int = 2,
+                 max_pending: int = 100, timeout_seconds: float = 300):
+        self.store = store
+        self.job_type = job_type
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        # Runs when the queue is built, i.e. at server warm-up; polls of a job
+        # whose process died later are failed by the store itself.
+        abandoned = self.store.fail_abandoned(older_than_seconds=self.timeout_seconds * 2)
+        if abandoned:
+            logger.warning(f"Marked {abandoned} abandoned {self.job_type} jobs as failed")
+
+    def _ensure_started(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"{self.job_type}-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} {self.job_type} job workers")
+
+    async def _worker(self, index: int):
+        # LLM calls made by the handler are attributed to the job type.
+        current_endpoint.set(f"job:{self.job_type}")
+        while True:
+            job_id, payload = await self._queue.get()
+            try:
+                await asyncio.to_thread(self.store.mark_running, job_id)
+                result = await asyncio.wait_for(self.handler(payload), timeout=self.timeout_seconds)
+                await asyncio.to_thread(self.store.mark_succeeded, job_id, result)
+                logger.info(f"{self.job_type} job {job_id} succeeded")
+            except asyncio.TimeoutError:
+                logger.error(f"{self.job_type} job {job_id} timed out after {self.timeout_seconds}s")
+                await asyncio.to_thread(self.store.mark_failed, job_id, f"Job timed out after {self.timeout_seconds}s")
+            except Exception as e:
+                logger.exception(f"{self.job_type} job {job_id} failed")
+                await asyncio.to_thread(self.store.mark_failed, job_id, str(e))
+            finally:
+                self._queue.task_done()
+
+    async def submit(self, payload: dict) -> str:
+        self._ensure_started()
+        if self._queue.full():
+            raise JobQueueFullError(f"Too many pending {self.job_type} jobs, try again later")
+        job_id = await asyncio.to_thread(self.store.create, self.job_type, payload)
+        try:
+            self._queue.put_nowait((job_id, payload))
+        except asyncio.QueueFull:
+            # Another submission filled the last slot while the job was being recorded.
+            await asyncio.to_thread(self.store.mark_failed, job_id, "Job queue was full")
+            raise JobQueueFullError(f"Too many pending {self.job_type} jobs, try again later")
+        return job_id
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_pending": self.max_pending,
+            "workers": self.workers,
+        }
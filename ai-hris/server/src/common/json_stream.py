@@ -0,0 +1,124 @@
+import json
+from typing import Any, Optional
+
+
+class IncrementalJSONObjectParser:
+    """Parses a streamed JSON object and reports each top-level member once it is complete.
+
+    ``feed`` returns events as soon as they can be decoded:
+
+    - ``{"event": "field", "name": ..., "value": ...}`` for a scalar or object member
+    - ``{"event": "item", "name": ..., "index": ..., "value": ...}`` for each element
+      of a top-level array, so long lists (e.g. work history) arrive item by item;
+      an empty array is reported as a ``field`` with value ``[]``
+
+    Only the characters added since the previous call are scanned.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expecting_key = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._array_key: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self.complete = False
+
+    def _field(self, end: int) -> dict:
+        return {"event": "field", "name": self._key, "value": json.loads(self.buffer[self._value_start:end])}
+
+    def _item(self, end: int) -> dict:
+        event = {
+            "event": "item",
+            "name": self._array_key,
+            "index": self._item_index,
+            "value": json.loads(self.buffer[self._item_start:end]),
+        }
+        self._item_start = None
+        self._item_index += 1
+        return event
+
+    def _end_member(self):
+        self._key = None
+        self._value_start = None
+        self._expecting_key = True
+
+    def feed(self, chunk: str) -> list[dict]:
+        events = []
+        self.buffer += chunk
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None:
+                        self._key = json.loads(buffer[self._key_start:i + 1])
+                        self._key_start = None
+                continue
+
+            if char.isspace() or self._depth == 0 and char != "{":
+                continue
+
+            in_array = self._depth == 2 and self._array_key is not None
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expecting_key:
+                    self._key_start = i
+                elif self._depth == 1 and self._value_start is None:
+                    self._value_start = i
+                elif in_array and self._item_start is None:
+                    self._item_start = i
+            elif char in "{[":
+                if self._depth == 0:
+                    self._expecting_key = True
+                elif self._depth == 1 and self._value_start is None:
+                    self._value_start = i
+                    if char == "[":
+                        self._array_key = self._key
+                        self._item_index = 0
+                elif in_array and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._array_key is not None:
+                    if self._item_start is not None:
+                        events.append(self._item(i))
+                    elif self._item_index == 0:
+                        events.append({"event": "field", "name": self._array_key, "value": []})
+                    self._array_key = None
+                    self._value_start = None
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        events.append(self._field(i))
+                    self.complete = True
+            elif char == ",":
+                if self._depth == 1:
+                    if self._value_start is not None:
+                        events.append(self._field(i))
+                    self._end_member()
+                elif in_array and self._item_start is not None:
+                    events.append(self._item(i))
+            elif char == ":":
+                if self._depth == 1:
+                    self._expecting_key = False
+            elif self._depth == 1 and not self._expecting_key and self._value_start is None:
+                self._value_start = i
+            elif in_array and self._item_start is None:
+                self._item_start = i
+        self._pos = len(buffer)
+        return events
+
+    def result(self) -> Any:
+        return json.loads(self.buffer)
@@ -0,0 +1,136 @@
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+# prometheus_client writes per-process files into PROMETHEUS_MULTIPROC_DIR on
+# the first metric update; gunicorn clears it on start, but CLIs and
+# ``python main.py`` run without that hook and need it to exist.
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Set per request (and per background job) so every LLM/embedding call made
+# while serving it is attributed to that endpoint. Context variables follow
+# coroutines submitted to the background event loop.
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="none")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "hris_http_request_duration_seconds",
+    "HTTP request latency until the response is returned",
+    ["endpoint", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_REQUESTS = Counter(
+    "hris_llm_requests_total",
+    "LLM and embedding calls",
+    ["operation", "model", "endpoint", "outcome"],
+)
+LLM_REQUEST_DURATION = Histogram(
+    "hris_llm_request_duration_seconds",
+    "LLM and embedding call latency",
+    ["operation", "model", "endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "hris_llm_tokens_total",
+    "Tokens reported by the model API",
+    ["operation", "model", "endpoint", "kind"],
+)
+LLM_COST = Counter(
+    "hris_llm_cost_usd_total",
+    "Estimated spend from token usage and LLM_TOKEN_PRICES",
+    ["operation", "model", "endpoint"],
+)
+CACHE_LOOKUPS = Counter(
+    "hris_cache_lookups_total",
+    "In-process cache lookups",
+    ["cache", "outcome"],
+)
+
+
+def _load_prices() -> dict:
+    """``LLM_TOKEN_PRICES='{"gpt-4.1-mini": [0.0004, 0.0016]}'``: USD per 1K prompt/completion tokens"""
+    try:
+        return {model: tuple(prices) for model, prices in json.loads(os.getenv("LLM_TOKEN_PRICES", "{}")).items()}
+    except (ValueError, TypeError):
+        return {}
+
+
+TOKEN_PRICES = _load_prices()
+
+
+def usage_from_metadata(metadata: Optional[dict]) -> tuple[int, int]:
+    """Prompt and completion tokens from a semantic-kernel message's ``usage`` metadata"""
+    usage = (metadata or {}).get("usage")
+    if usage is None:
+        return 0, 0
+    return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+
+
+class LLMCall:
+    def __init__(self, operation: str, model: str):
+        self.operation = operation
+        self.model = model or "unknown"
+        self.endpoint = current_endpoint.get()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def record_usage(self, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.prompt_tokens += prompt_tokens or 0
+        self.completion_tokens += completion_tokens or 0
+
+    def _flush(self, outcome: str, elapsed: float):
+        labels = (self.operation, self.model, self.endpoint)
+        LLM_REQUESTS.labels(*labels, outcome).inc()
+        LLM_REQUEST_DURATION.labels(*labels).observe(elapsed)
+        if self.prompt_tokens:
+            LLM_TOKENS.labels(*labels, "prompt").inc(self.prompt_tokens)
+        if self.completion_tokens:
+            LLM_TOKENS.labels(*labels, "completion").inc(self.completion_tokens)
+        prices = TOKEN_PRICES.get(self.model)
+        if prices and (self.prompt_tokens or self.completion_tokens):
+            LLM_COST.labels(*labels).inc(
+                self.prompt_tokens / 1000 * prices[0] + self.completion_tokens / 1000 * prices[1]
+            )
+
+
+@asynccontextmanager
+async def track_llm_call(operation: str, model: str) -> AsyncIterator[LLMCall]:
+    """Time an LLM/embedding call and record its outcome and reported token usage"""
+    call = LLMCall(operation, model)
+    started = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call._flush("error", time.perf_counter() - started)
+        raise
+    call._flush("success", time.perf_counter() - started)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Metrics in the Prometheus text format, merged across gunicorn workers when
+    ``PROMETHEUS_MULTIPROC_DIR`` is set"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from loguru import logger
+
+
+class ClientProvider:
+    """Builds shared clients on first use instead of at import time.
+
+    Each client is registered with a factory and constructed once, under its own
+    lock, the first time it is requested (``provider.get("cosmosdb")`` or
+    ``provider.cosmosdb``). Factories may request other clients. A failed build
+    is not cached, so the next request retries it — an unreachable backend only
+    fails the requests that need it.
+
+    ``warm_up`` builds clients ahead of traffic; ``warm_up_in_background``
+    keeps retrying the ones that failed, with exponential backoff, so a backend
+    that is briefly down at boot does not keep the service unready. ``status``
+    reports which are ready for a readiness probe.
+    """
+
+    def __init__(self):
+        self._factories: dict[str, Callable[[], Any]] = {}
+        self._instances: dict[str, Any] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._errors: dict[str, str] = {}
+        self._build_seconds: dict[str, float] = {}
+        self.warm_up_started = False
+        self.warm_up_finished = False
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._factories:
+            raise KeyError(f"Unknown client: {name}")
+        with self._locks[name]:
+            if name not in self._instances:
+                started = time.perf_counter()
+                try:
+                    instance = self._factories[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._build_seconds[name] = time.perf_counter() - started
+                self._errors.pop(name, None)
+                self._instances[name] = instance
+                logger.info(f"Built {name} in {self._build_seconds[name]:.2f}s")
+        return self._instances[name]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name not in self._factories:
+            raise AttributeError(name)
+        return self.get(name)
+
+    def is_ready(self, name: str) -> bool:
+        return name in self._instances
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> bool:
+        """Build the given (default: all) clients, returning whether all succeeded"""
+        self.warm_up_started = True
+        succeeded = True
+        for name in names or list(self._factories):
+            try:
+                self.get(name)
+            except Exception as e:
+                succeeded = False
+                logger.error(f"Warm-up of {name} failed: {e}")
+        self.warm_up_finished = True
+        return succeeded
+
+    def _warm_up_until_ready(self, names: Optional[Iterable[str]], retry_seconds: float, max_retry_seconds: float):
+        names = list(names or self._factories)
+        delay = retry_seconds
+        while not self.warm_up(names):
+            names = [name for name in names if name not in self._instances]
+            logger.warning(f"Retrying warm-up of {', '.join(names)} in {delay:g}s")
+            time.sleep(delay)
+            delay = min(delay * 2, max_retry_seconds)
+
+    def warm_up_in_background(self, names: Optional[Iterable[str]] = None, retry_seconds: float = 1.0,
+                              max_retry_seconds: float = 60.0) -> threading.Thread:
+        """Warm up in a daemon thread, retrying failed builds until every client is ready"""
+        thread = threading.Thread(
+            target=self._warm_up_until_ready,
+            args=(names, retry_seconds, max_retry_seconds),
+            name="client-warm-up",
+            daemon=True
+        )
+        thread.start()
+        return thread
+
+    @property
+    def ready(self) -> bool:
+        return all(name in self._instances for name in self._factories)
+
+    @property
+    def status(self) -> dict:
+        clients = {}
+        for name in self._factories:
+            if name in self._instances:
+                clients[name] = {"status": "ready", "build_seconds": round(self._build_seconds[name], 3)}
+            elif name in self._errors:
+                clients[name] = {"status": "failed", "error": self._errors[name]}
+            else:
+                clients[name] = {"status": "pending"}
+        return {
+            "ready": self.ready,
+            "warm_up_started": self.warm_up_started,
+            "warm_up_finished": self.warm_up_finished,
+            "clients": clients,
+        }
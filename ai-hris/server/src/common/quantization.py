@@ -0,0 +1,44 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+FLOAT32 = "float32"
+INT8 = "int8"
+EMBEDDING_FORMATS = (FLOAT32, INT8)
+
+
+def truncate_embedding(vector: Sequence[float], dimensions: int) -> List[float]:
+    """Keep the first ``dimensions`` values and re-normalize.
+
+    Only valid for models trained for shortening (text-embedding-3-*), where this
+    matches requesting ``dimensions`` from the API.
+    """
+    array = np.asarray(vector, dtype=np.float32)
+    if not dimensions or dimensions >= len(array):
+        return array.tolist()
+    array = array[:dimensions]
+    norm = np.linalg.norm(array)
+    if norm > 0:
+        array = array / norm
+    return array.tolist()
+
+
+def quantize_int8(vector: Sequence[float]) -> Tuple[List[int], float]:
+    """Symmetric per-vector int8 quantization; returns the codes and their scale"""
+    array = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.max(np.abs(array))) if len(array) else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    codes = np.clip(np.rint(array / scale), -127, 127).astype(np.int8)
+    return codes.tolist(), scale
+
+
+def dequantize_int8(codes: Sequence[int], scale: float) -> np.ndarray:
+    return np.asarray(codes, dtype=np.float32) * np.float32(scale or 1.0)
+
+
+def cosine_similarity(query: Sequence[float], vectors: np.ndarray) -> np.ndarray:
+    query = np.asarray(query, dtype=np.float32)
+    query_norm = np.linalg.norm(query) or 1.0
+    norms = np.linalg.norm(vectors, axis=-1)
+    norms[norms == 0] = 1.0
+    return (vectors @ query) / (norms * query_norm)
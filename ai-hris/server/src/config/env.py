@@ -19,4 +19,77 @@ class AppConfig:
     AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME: str = os.getenv('AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME', 'text-embedding-ada-002')
     AZURE_OPENAI_EMBEDDING_API_VERSION: str = os.getenv('AZURE_OPENAI_EMBEDDING_API_VERSION', '2024-02-15-preview')
     AZURE_OPENAI_EMBEDDING_API_KEY: str = os.getenv('AZURE_OPENAI_EMBEDDING_API_KEY', '')
-    AZURE_OPENAI_EMBEDDING_ENDPOINT: str = os.getenv('AZURE_OPENAI_EMBEDDING_ENDPOINT', '')
\ No newline at end of file
+    AZURE_OPENAI_EMBEDDING_ENDPOINT: str = os.getenv('AZURE_OPENAI_EMBEDDING_ENDPOINT', '')
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv('EMBEDDING_CACHE_SIZE', 1024))
+    EMBEDDING_CACHE_TTL_SECONDS: float = float(os.getenv('EMBEDDING_CACHE_TTL_SECONDS', 86400))
+    EMBEDDING_DIMENSIONS: int = int(os.getenv('EMBEDDING_DIMENSIONS', 0))
+    EMBEDDING_STORAGE_FORMAT: str = os.getenv('EMBEDDING_STORAGE_FORMAT', 'float32')
+    EMBEDDING_RESCORE_OVERSAMPLE: int = int(os.getenv('EMBEDDING_RESCORE_OVERSAMPLE', 4))
+
+    CV_CACHE_ENABLED: bool = os.getenv('CV_CACHE_ENABLED', 'true').lower() == 'true'
+    CV_CACHE_PATH: str = os.getenv('CV_CACHE_PATH', '.cache/cv_extraction.sqlite3')
+    CV_CACHE_MEMORY_SIZE: int = int(os.getenv('CV_CACHE_MEMORY_SIZE', 256))
+    CV_CACHE_MAX_ENTRIES: int = int(os.getenv('CV_CACHE_MAX_ENTRIES', 10000))
+
+    CV_BULK_CONCURRENCY: int = int(os.getenv('CV_BULK_CONCURRENCY', 4))
+    CV_BULK_MAX_CONCURRENCY: int = int(os.getenv('CV_BULK_MAX_CONCURRENCY', 16))
+    CV_BULK_MAX_FILES: int = int(os.getenv('CV_BULK_MAX_FILES', 500))
+    CV_BULK_MAX_FILE_SIZE: int = int(os.getenv('CV_BULK_MAX_FILE_SIZE', 20 * 1024 * 1024))
+    MAX_REQUEST_SIZE: int = int(os.getenv('MAX_REQUEST_SIZE', 200 * 1024 * 1024))
+
+    CV_PARSER_PROCESSES: int = int(os.getenv('CV_PARSER_PROCESSES', 0))
+    CV_PARSER_PAGES_PER_TASK: int = int(os.getenv('CV_PARSER_PAGES_PER_TASK', 10))
+    CV_PARSER_MAX_PAGES: int = int(os.getenv('CV_PARSER_MAX_PAGES', 100))
+    CV_PARSER_TIMEOUT_SECONDS: float = float(os.getenv('CV_PARSER_TIMEOUT_SECONDS', 30))
+    CV_TEXT_MAX_CHARS: int = int(os.getenv('CV_TEXT_MAX_CHARS', 100000))
+    CV_TEXT_MAX_TOKENS: int = int(os.getenv('CV_TEXT_MAX_TOKENS', 0))
+
+    CV_SCORING_CONCURRENCY: int = int(os.getenv('CV_SCORING_CONCURRENCY', 8))
+    CV_SCORING_BATCH_MAX_CANDIDATES: int = int(os.getenv('CV_SCORING_BATCH_MAX_CANDIDATES', 500))
+    SCORE_STORE_PATH: str = os.getenv('SCORE_STORE_PATH', '.cache/cv_scores.sqlite3')
+
+    INDEXING_BATCH_SIZE: int = int(os.getenv('INDEXING_BATCH_SIZE', 16))
+    INDEXING_CONCURRENCY: int = int(os.getenv('INDEXING_CONCURRENCY', 8))
+    INDEXING_MAX_CANDIDATES: int = int(os.getenv('INDEXING_MAX_CANDIDATES', 1000))
+
+    VECTOR_BACKEND: str = os.getenv('VECTOR_BACKEND', 'cosmos')
+    VECTOR_INDEX_PATH: str = os.getenv('VECTOR_INDEX_PATH', '.cache/vector_index')
+    VECTOR_INDEX_NLIST: int = int(os.getenv('VECTOR_INDEX_NLIST', 0))
+    VECTOR_INDEX_NPROBE: int = int(os.getenv('VECTOR_INDEX_NPROBE', 8))
+    VECTOR_INDEX_RELOAD_SECONDS: float = float(os.getenv('VECTOR_INDEX_RELOAD_SECONDS', 60))
+
+    RECOMMEND_MODE: str = os.getenv('RECOMMEND_MODE', 'vector')
+    RECOMMEND_NUM_RESULTS: int = int(os.getenv('RECOMMEND_NUM_RESULTS', 5))
+    RECOMMEND_MAX_RESULTS: int = int(os.getenv('RECOMMEND_MAX_RESULTS', 100))
+    RECOMMEND_TOP_K: int = int(os.getenv('RECOMMEND_TOP_K', 200))
+    RECOMMEND_MAX_TOP_K: int = int(os.getenv('RECOMMEND_MAX_TOP_K', 1000))
+    RECOMMEND_RERANK_ALPHA: float = float(os.getenv('RECOMMEND_RERANK_ALPHA', 0.7))
+    RECOMMEND_PAGE_WINDOW: int = int(os.getenv('RECOMMEND_PAGE_WINDOW', 50))
+    RECOMMEND_SESSION_STORE_PATH: str = os.getenv('RECOMMEND_SESSION_STORE_PATH', '.cache/recommendation_sessions.sqlite3')
+    RECOMMEND_SESSION_TTL_SECONDS: float = float(os.getenv('RECOMMEND_SESSION_TTL_SECONDS', 300))
+
+    JOB_MATCH_STORE_PATH: str = os.getenv('JOB_MATCH_STORE_PATH', '.cache/job_matches.sqlite3')
+    JOB_MATCH_TOP_K: int = int(os.getenv('JOB_MATCH_TOP_K', 200))
+    JOB_MATCH_CHUNK_SIZE: int = int(os.getenv('JOB_MATCH_CHUNK_SIZE', 8192))
+    JOB_MATCH_MAX_JOBS: int = int(os.getenv('JOB_MATCH_MAX_JOBS', 1000))
+
+    BROWSER_POOL_SIZE: int = int(os.getenv('BROWSER_POOL_SIZE', 2))
+    BROWSER_MAX_CONTEXTS_PER_BROWSER: int = int(os.getenv('BROWSER_MAX_CONTEXTS_PER_BROWSER', 4))
+    BROWSER_MAX_PAGES_PER_BROWSER: int = int(os.getenv('BROWSER_MAX_PAGES_PER_BROWSER', 200))
+    BROWSER_HEADLESS: bool = os.getenv('BROWSER_HEADLESS', 'true').lower() == 'true'
+
+    BACKGROUND_CHECK_TWEETS: int = int(os.getenv('BACKGROUND_CHECK_TWEETS', 5))
+    BACKGROUND_CHECK_CACHE_ENABLED: bool = os.getenv('BACKGROUND_CHECK_CACHE_ENABLED', 'true').lower() == 'true'
+    BACKGROUND_CHECK_CACHE_PATH: str = os.getenv('BACKGROUND_CHECK_CACHE_PATH', '.cache/background_checks.sqlite3')
+    BACKGROUND_CHECK_CACHE_TTL_SECONDS: float = float(os.getenv('BACKGROUND_CHECK_CACHE_TTL_SECONDS', 86400))
+    BACKGROUND_CHECK_CACHE_STALE_SECONDS: float = float(os.getenv('BACKGROUND_CHECK_CACHE_STALE_SECONDS', 7 * 86400))
+    BACKGROUND_CHECK_WORKERS: int = int(os.getenv('BACKGROUND_CHECK_WORKERS', 2))
+    BACKGROUND_CHECK_MAX_PENDING: int = int(os.getenv('BACKGROUND_CHECK_MAX_PENDING', 100))
+    BACKGROUND_CHECK_TIMEOUT_SECONDS: float = float(os.getenv('BACKGROUND_CHECK_TIMEOUT_SECONDS', 180))
+    JOB_STORE_PATH: str = os.getenv('JOB_STORE_PATH', '.cache/jobs.sqlite3')
+
+    SENTIMENT_DEPLOYMENT_NAME: str = os.getenv('SENTIMENT_DEPLOYMENT_NAME', 'gpt-4.1-mini')
+    SENTIMENT_API_VERSION: str = os.getenv('SENTIMENT_API_VERSION', '2024-10-21')
+    SENTIMENT_BATCH_MAX_TOKENS: int = int(os.getenv('SENTIMENT_BATCH_MAX_TOKENS', 6000))
+
+    WARM_UP_ON_START: bool = os.getenv('WARM_UP_ON_START', 'true').lower() == 'true'
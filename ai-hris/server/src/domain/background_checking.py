@@ -0,0 +1,12 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+SENTIMENT_LABELS = ("Positive", "Negative", "Neutral")
+
+class SentimentItem(BaseModel):
+    index: int
+    sentiment: Literal["Positive", "Negative", "Neutral"]
+
+class SentimentBatchResponse(BaseModel):
+    results: list[SentimentItem]
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class KernelBaseModel(BaseModel):
+    """Same configuration as ``semantic_kernel.kernel_pydantic.KernelBaseModel``.
+
+    Importing that module loads the whole kernel package, which the domain
+    models (used at import time for schemas and cache versions) do not need.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True, validate_assignment=True)
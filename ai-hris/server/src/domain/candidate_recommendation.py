@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 class CandidateData(BaseModel):
@@ -8,6 +10,7 @@ class CandidateData(BaseModel):
     candidate_work_history: str
 
 class JobData(BaseModel):
+    job_id: Optional[str] = None
     job_title: str
     job_description: str
     job_skills: str
@@ -1,4 +1,5 @@
-from semantic_kernel.kernel_pydantic import KernelBaseModel
+from pydantic import BaseModel
+from src.domain.base import KernelBaseModel
 
 class EducationHistoryItem(KernelBaseModel):
     institution_name: str
@@ -35,4 +36,12 @@ class CVAttributeExtractionResponse(KernelBaseModel):
     highest_degree: str
     total_year_of_experience: str
     education_history: list[EducationHistoryItem] = []
-    work_history: list[WorkHistoryItem] = []
\ No newline at end of file
+    work_history: list[WorkHistoryItem] = []
+
+class ExtractedText(BaseModel):
+    text: str
+    pages_read: int = 0
+    total_pages: int = 0
+    truncated: bool = False
+    truncated_pages: int = 0
+    truncated_chars: int = 0
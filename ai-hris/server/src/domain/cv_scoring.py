@@ -1,4 +1,4 @@
-from semantic_kernel.kernel_pydantic import KernelBaseModel
+from src.domain.base import KernelBaseModel
 
 class CVScoringAttributeDetails(KernelBaseModel):
     subattribute_name: str
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import threading
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from src.common.cache import LRUCache
+from src.domain.cv_extractor import CVAttributeExtractionResponse
+from src.domain.cv_scoring import CVScoringResponse
+from src.llm.prompt import _get_cv_extractor_system_prompt, _get_predefined_score_system_prompt
+
+if TYPE_CHECKING:
+    from semantic_kernel.agents import ChatCompletionAgent
+    from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+
+
+def criteria_hash(criteria: Any) -> str:
+    """Stable SHA-256 of a scoring criteria payload (dict or string)."""
+    if isinstance(criteria, str):
+        payload = criteria
+    else:
+        payload = json.dumps(criteria, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AgentRegistry:
+    """Builds each ChatCompletionAgent once and reuses it across requests.
+
+    The CV extractor agent has static instructions, so a single instance is shared.
+    Scoring agents depend on the ``predefined_score`` criteria and are cached by a
+    hash of it in a bounded LRU.
+    """
+
+    def __init__(self, service: "AzureChatCompletion", max_scoring_agents: int = 128):
+        self.service = service
+        self._lock = threading.Lock()
+        self._cv_extractor_agent = None
+        self._scoring_agents = LRUCache(max_size=max_scoring_agents)
+
+    def cv_extractor_agent(self) -> "ChatCompletionAgent":
+        from semantic_kernel.agents import ChatCompletionAgent
+        from semantic_kernel.connectors.ai.open_ai import OpenAIChatPromptExecutionSettings
+        from semantic_kernel.functions import KernelArguments
+
+        if self._cv_extractor_agent is None:
+            with self._lock:
+                if self._cv_extractor_agent is None:
+                    settings = OpenAIChatPromptExecutionSettings()
+                    settings.response_format = CVAttributeExtractionResponse
+                    self._cv_extractor_agent = ChatCompletionAgent(
+                        service=self.service,
+                        name="CVExtractorAgent",
+                        instructions=_get_cv_extractor_system_prompt(),
+                        arguments=KernelArguments(settings=settings)
+                    )
+                    logger.info("Built CVExtractorAgent")
+        return self._cv_extractor_agent
+
+    def cv_scoring_agent(self, predefined_score: Any) -> "ChatCompletionAgent":
+        from semantic_kernel.agents import ChatCompletionAgent
+        from semantic_kernel.connectors.ai.open_ai import OpenAIChatPromptExecutionSettings
+        from semantic_kernel.functions import KernelArguments
+
+        key = criteria_hash(predefined_score)
+
+        def _build() -> ChatCompletionAgent:
+            settings = OpenAIChatPromptExecutionSettings()
+            settings.response_format = CVScoringResponse
+            logger.info(f"Built CVScoringAgent for criteria {key[:12]}")
+            return ChatCompletionAgent(
+                service=self.service,
+                name="CVScoringAgent",
+                instructions=_get_predefined_score_system_prompt(predefined_score),
+                arguments=KernelArguments(settings=settings)
+            )
+
+        return self._scoring_agents.get_or_create(key, _build)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "cv_extractor_agent_built": self._cv_extractor_agent is not None,
+            "scoring_agents": self._scoring_agents.stats,
+        }
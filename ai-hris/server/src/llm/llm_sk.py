@@ -1,16 +1,26 @@
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion, OpenAIChatPromptExecutionSettings
 from loguru import logger
-from src.llm.prompt import _get_cv_extractor_system_prompt, _get_predefined_score_system_prompt
-from src.domain.cv_extractor import CVAttributeExtractionResponse
-from semantic_kernel.agents import ChatCompletionAgent
-from semantic_kernel.functions import KernelArguments
-from semantic_kernel.contents import ChatMessageContent, TextContent, ImageContent
-from semantic_kernel.contents.utils.author_role import AuthorRole
 import json
-from src.domain.cv_scoring import CVScoringResponse, CVScoringAttribute
+from typing import AsyncIterator
+from src.common.metrics import track_llm_call, usage_from_metadata
+
+# semantic_kernel takes seconds to import, so it is loaded when the first
+# service is built rather than when this module is imported.
+
+def _user_message(prompt: str):
+    from semantic_kernel.contents import ChatMessageContent, TextContent
+    from semantic_kernel.contents.utils.author_role import AuthorRole
+
+    return ChatMessageContent(
+        role=AuthorRole.USER,
+        items=[
+            TextContent(text=prompt)
+        ]
+    )
 
 class LLMService:
     def __init__(self, service_id: str = "default_service", azure_openai_key=None, azure_openai_endpoint=None, azure_openai_deployment=None, azure_openai_version=None):
+        from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+        from src.llm.agent_registry import AgentRegistry
 
         self.azure_chat_completion = AzureChatCompletion(
             service_id=service_id,
@@ -19,65 +29,66 @@ class LLMService:
             api_key=azure_openai_key,
             endpoint=azure_openai_endpoint
         )
+        self.deployment = azure_openai_deployment
+        self.agents = AgentRegistry(service=self.azure_chat_completion)
 
     async def extract_cv_attributes(self, cv_text: str) -> dict:
         try:
-            instructions = _get_cv_extractor_system_prompt()
-            settings = OpenAIChatPromptExecutionSettings()
-            settings.response_format = CVAttributeExtractionResponse
-
             prompt = f"""
             Here is the CV text:
             {cv_text}
             """
 
-            chat_content = ChatMessageContent(
-                role=AuthorRole.USER,
-                items=[
-                    TextContent(text=prompt)
-                ]
-            )
+            chat_content = _user_message(prompt)
 
-            agent = ChatCompletionAgent(
-                service=self.azure_chat_completion,
-                name="CVExtractorAgent",
-                instructions=instructions,
-                arguments=KernelArguments(settings=settings)
-            ) 
+            agent = self.agents.cv_extractor_agent()
 
-            response = await agent.get_response(chat_content)
+            async with track_llm_call("extract_cv_attributes", self.deployment) as call:
+                response = await agent.get_response(chat_content)
+                call.record_usage(*usage_from_metadata(response.content.metadata))
 
             return json.loads(str(response.content))
         
         except Exception as e:
             raise Exception(f"Error extracting CV attributes: {str(e)}")
         
-    async def score_cv(self, predefined_score: str, candidate_data: str) -> str:
+    async def extract_cv_attributes_stream(self, cv_text: str) -> AsyncIterator[str]:
+        """Stream the raw JSON text of the structured CV extraction as the model produces it"""
         try:
-            instructions = _get_predefined_score_system_prompt(predefined_score)
-            settings = OpenAIChatPromptExecutionSettings()
-            settings.response_format = CVScoringResponse
+            prompt = f"""
+            Here is the CV text:
+            {cv_text}
+            """
+
+            chat_content = _user_message(prompt)
 
+            agent = self.agents.cv_extractor_agent()
+
+            async with track_llm_call("extract_cv_attributes_stream", self.deployment) as call:
+                async for response in agent.invoke_stream(chat_content):
+                    # Usage is reported on the final chunk of the stream.
+                    call.record_usage(*usage_from_metadata(response.content.metadata))
+                    chunk = response.content.content
+                    if chunk:
+                        yield chunk
+
+        except Exception as e:
+            raise Exception(f"Error extracting CV attributes: {str(e)}")
+
+    async def score_cv(self, predefined_score: str, candidate_data: str) -> str:
+        try:
             prompt = f"""
             Candidate:
             {candidate_data}
             """
 
-            chat_content = ChatMessageContent(
-                role=AuthorRole.USER,
-                items=[
-                    TextContent(text=prompt)
-                ]
-            )
-
-            agent = ChatCompletionAgent(
-                service=self.azure_chat_completion,
-                name="CVScoringAgent",
-                instructions=instructions,
-                arguments=KernelArguments(settings=settings)
-            )
-
-            response = await agent.get_response(chat_content)
+            chat_content = _user_message(prompt)
+
+            agent = self.agents.cv_scoring_agent(predefined_score)
+
+            async with track_llm_call("score_cv", self.deployment) as call:
+                response = await agent.get_response(chat_content)
+                call.record_usage(*usage_from_metadata(response.content.metadata))
 
             return json.loads(str(response.content))
 
@@ -151,4 +151,15 @@ def _get_predefined_score_system_prompt(criteria: str):
 
     Evaluate candidate score based on this criteria:
     {criteria}
-    """
\ No newline at end of file
+    """
+
+
+def _get_sentiment_batch_system_prompt():
+    return """
+        You are a sentiment analysis assistant that must strictly classify sentiment as 'Positive', 'Negative', or 'Neutral' only.
+        You're a very strict investigator confident with your classification.
+
+        You will receive a numbered list of texts, each introduced by a line like `[3]`.
+        Classify every text independently and return exactly one result per text,
+        using the same index. Do not skip, merge or add items.
+    """
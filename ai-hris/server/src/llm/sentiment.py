@@ -0,0 +1,115 @@
+import asyncio
+from typing import TYPE_CHECKING, List, Optional
+
+from loguru import logger
+
+from src.common.metrics import track_llm_call
+from src.domain.background_checking import SENTIMENT_LABELS, SentimentBatchResponse
+from src.llm.prompt import _get_sentiment_batch_system_prompt
+from src.usecase.document_text import CHARS_PER_TOKEN
+
+if TYPE_CHECKING:
+    from openai import AsyncAzureOpenAI
+
+# Per-item overhead of the "[index]" header and the matching JSON result.
+ITEM_OVERHEAD_TOKENS = 16
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + ITEM_OVERHEAD_TOKENS
+
+
+def count_sentiments(labels: List[Optional[str]]) -> dict:
+    """Count labels per sentiment; unlabeled (None) texts are left out"""
+    counts = {"Negative": 0, "Neutral": 0, "Positive": 0}
+    for label in labels:
+        if label is not None:
+            counts[label] = counts.get(label, 0) + 1
+    return counts
+
+
+class SentimentClassifier:
+    """Classifies many texts with one structured-output chat completion per batch.
+
+    Texts are packed into batches of at most ``max_batch_tokens`` (estimated)
+    input tokens and ``max_batch_items`` items; batches run concurrently. Each
+    text is cut to ``max_item_chars`` so one long post cannot fill a batch.
+    Texts the model leaves out are sent again, up to ``max_retries`` times, and
+    stay unlabeled (None) after that rather than getting a made-up label.
+    Structured outputs need API version 2024-08-01-preview or later.
+    """
+
+    def __init__(self, client: "AsyncAzureOpenAI", deployment: str, max_batch_tokens: int = 6000,
+                 max_batch_items: int = 50, max_item_chars: int = 4000, concurrency: int = 4, max_retries: int = 1):
+        self.client = client
+        self.deployment = deployment
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_items = max_batch_items
+        self.max_item_chars = max_item_chars
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+
+    def _batches(self, texts: List[str]) -> List[List[int]]:
+        batches, current, current_tokens = [], [], 0
+        for index, text in enumerate(texts):
+            tokens = estimate_tokens(text)
+            if current and (current_tokens + tokens > self.max_batch_tokens or len(current) >= self.max_batch_items):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _classify_batch(self, texts: List[str]) -> List[Optional[str]]:
+        prompt = "\n\n".join(f"[{index}]\n{text}" for index, text in enumerate(texts))
+        async with track_llm_call("classify_sentiment", self.deployment) as call:
+            response = await self.client.chat.completions.parse(
+                model=self.deployment,
+                messages=[
+                    {"role": "system", "content": _get_sentiment_batch_system_prompt()},
+                    {"role": "user", "content": prompt},
+                ],
+                response_format=SentimentBatchResponse,
+                temperature=0.0,
+            )
+            if response.usage:
+                call.record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+        parsed = response.choices[0].message.parsed
+        labels: List[Optional[str]] = [None] * len(texts)
+        for item in parsed.results if parsed else []:
+            if 0 <= item.index < len(texts):
+                labels[item.index] = item.sentiment
+        return labels
+
+    async def classify(self, texts: List[str]) -> List[Optional[str]]:
+        """Return 'Positive', 'Negative', 'Neutral' or None (unlabeled) per text, in order"""
+        if not texts:
+            return []
+        texts = [(text or "")[:self.max_item_chars] for text in texts]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _run(indices: List[int]) -> List[Optional[str]]:
+            async with semaphore:
+                return await self._classify_batch([texts[index] for index in indices])
+
+        labels: List[Optional[str]] = [None] * len(texts)
+        pending = list(range(len(texts)))
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                logger.info(f"Retrying sentiment classification of {len(pending)} unlabeled texts")
+            # _batches returns positions in ``pending``; map them back to text indices.
+            batches = [[pending[position] for position in batch] for batch in self._batches([texts[index] for index in pending])]
+            results = await asyncio.gather(*[_run(indices) for indices in batches])
+            for indices, batch_labels in zip(batches, results):
+                for index, label in zip(indices, batch_labels):
+                    if label in SENTIMENT_LABELS:
+                        labels[index] = label
+            pending = [index for index in pending if labels[index] is None]
+            if not pending:
+                break
+
+        if pending:
+            logger.warning(f"Sentiment classifier returned no label for {len(pending)} of {len(texts)} texts, leaving them unlabeled")
+        return labels
@@ -0,0 +1,61 @@
+import json
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+from loguru import logger
+
+from src.repository.sqlite_db import open_sqlite
+
+
+class BackgroundCheckCache:
+    """Persistent store of scraped profile content and sentiment labels.
+
+    Entries are keyed by source and profile (e.g. ``x:elonmusk``) and keep the
+    time they were fetched, so callers can decide whether a result is fresh,
+    stale but servable, or expired. Rows older than ``max_age_seconds`` are
+    pruned on write.
+    """
+
+    def __init__(self, db_path: str, max_age_seconds: float = 30 * 86400):
+        self.db_path = db_path
+        self.max_age_seconds = max_age_seconds
+
+        self._conn, self._lock = open_sqlite(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS background_checks (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        """Return ``(result, age_seconds)`` or None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT result, fetched_at FROM background_checks WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Background check cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), time.time() - row[1]
+
+    def set(self, key: str, result: dict):
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO background_checks (key, result, fetched_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), now)
+                )
+                self._conn.execute("DELETE FROM background_checks WHERE fetched_at < ?", (now - self.max_age_seconds,))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Background check cache write failed: {e}")
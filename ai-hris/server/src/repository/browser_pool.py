@@ -0,0 +1,163 @@
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    # Playwright is imported by ``start`` so that importing the pool (and the
+    # background-check usecase) does not load it.
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+)
+
+
+class _PooledBrowser:
+    _ids = itertools.count(1)
+
+    def __init__(self, browser: "Browser"):
+        self.id = next(self._ids)
+        self.browser = browser
+        self.active_contexts = 0
+        self.pages_opened = 0
+        self.retiring = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.browser.is_connected() and not self.retiring
+
+
+class BrowserPool:
+    """Long-lived headless Chromium instances shared by background checks.
+
+    Launching Chromium costs seconds, so browsers are started once and reused;
+    every job still gets a fresh ``BrowserContext`` (its own cookies, storage
+    and cache) that is closed when the job ends. At most ``size`` browsers run,
+    each serving up to ``max_contexts_per_browser`` jobs at once. A browser is
+    replaced when it disconnects or after ``max_pages_per_browser`` pages, which
+    bounds the memory Chromium accumulates over time.
+
+    All methods must be awaited on the same event loop (the shared background
+    loop in the server).
+    """
+
+    def __init__(self, size: int = 2, max_contexts_per_browser: int = 4, max_pages_per_browser: int = 200,
+                 headless: bool = True, launch_timeout_seconds: float = 30):
+        self.size = max(1, size)
+        self.max_contexts_per_browser = max(1, max_contexts_per_browser)
+        self.max_pages_per_browser = max_pages_per_browser
+        self.headless = headless
+        self.launch_timeout_seconds = launch_timeout_seconds
+        self._playwright: Optional["Playwright"] = None
+        self._browsers: list[_PooledBrowser] = []
+        self._condition: Optional[asyncio.Condition] = None
+        self.launched = 0
+        self.recycled = 0
+
+    async def start(self):
+        if self._playwright is not None:
+            return
+        self._condition = self._condition or asyncio.Condition()
+        async with self._condition:
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+
+    async def _launch(self) -> _PooledBrowser:
+        browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            timeout=self.launch_timeout_seconds * 1000
+        )
+        pooled = _PooledBrowser(browser)
+        self._browsers.append(pooled)
+        self.launched += 1
+        logger.info(f"Launched pooled browser #{pooled.id} ({len(self._browsers)}/{self.size})")
+        return pooled
+
+    async def _close_browser(self, pooled: _PooledBrowser):
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser #{pooled.id}: {e}")
+
+    async def _checkout(self) -> _PooledBrowser:
+        async with self._condition:
+            while True:
+                for pooled in [pooled for pooled in self._browsers if not pooled.browser.is_connected()]:
+                    logger.warning(f"Pooled browser #{pooled.id} disconnected, replacing it")
+                    await self._close_browser(pooled)
+
+                candidates = [
+                    pooled for pooled in self._browsers
+                    if pooled.healthy and pooled.active_contexts < self.max_contexts_per_browser
+                ]
+                if not any(pooled.active_contexts == 0 for pooled in candidates) and len(self._browsers) < self.size:
+                    pooled = await self._launch()
+                    break
+                if candidates:
+                    pooled = min(candidates, key=lambda pooled: pooled.active_contexts)
+                    break
+                # Every browser is full or retiring; wait for a job to finish.
+                await self._condition.wait()
+            pooled.active_contexts += 1
+            return pooled
+
+    async def _checkin(self, pooled: _PooledBrowser):
+        async with self._condition:
+            pooled.active_contexts -= 1
+            if self.max_pages_per_browser and pooled.pages_opened >= self.max_pages_per_browser:
+                pooled.retiring = True
+            if pooled.retiring and pooled.active_contexts == 0:
+                logger.info(f"Recycling pooled browser #{pooled.id} after {pooled.pages_opened} pages")
+                self.recycled += 1
+                await self._close_browser(pooled)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator["BrowserContext"]:
+        """Yield a fresh, isolated browser context on a pooled browser"""
+        await self.start()
+        context_options.setdefault("user_agent", DEFAULT_USER_AGENT)
+        pooled = await self._checkout()
+        context = None
+        try:
+            context = await pooled.browser.new_context(**context_options)
+
+            def _count_page(_page):
+                pooled.pages_opened += 1
+
+            context.on("page", _count_page)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing browser context on browser #{pooled.id}: {e}")
+            await self._checkin(pooled)
+
+    async def close(self):
+        if self._playwright is None:
+            return
+        async with self._condition:
+            for pooled in list(self._browsers):
+                await self._close_browser(pooled)
+            await self._playwright.stop()
+            self._playwright = None
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "browsers": len(self._browsers),
+            "size": self.size,
+            "active_contexts": sum(pooled.active_contexts for pooled in self._browsers),
+            "launched": self.launched,
+            "recycled": self.recycled,
+        }
@@ -0,0 +1,39 @@
+import os
+import threading
+from typing import Iterable
+
+from loguru import logger
+
+
+class IndexingCheckpoint:
+    """Append-only file of processed ids so an interrupted bulk run can resume"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = set()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._done = {line.strip() for line in f if line.strip()}
+            logger.info(f"Loaded checkpoint {path} with {len(self._done)} processed ids")
+
+    def is_done(self, item_id: str) -> bool:
+        return str(item_id) in self._done
+
+    def mark_done(self, item_ids: Iterable[str]):
+        new_ids = [str(item_id) for item_id in item_ids if str(item_id) not in self._done]
+        if not new_ids:
+            return
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(new_ids) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._done.update(new_ids)
+
+    def __len__(self) -> int:
+        return len(self._done)
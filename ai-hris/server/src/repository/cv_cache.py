@@ -0,0 +1,94 @@
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Optional
+
+from loguru import logger
+
+from src.common.cache import LRUCache
+from src.repository.sqlite_db import open_sqlite
+
+
+class CVExtractionCache:
+    """Content-addressed cache for structured CV extraction results.
+
+    Entries are keyed by the SHA-256 of the decoded file bytes plus the
+    prompt/schema version, so re-uploads of the same resume skip both text
+    extraction and the LLM call. Lookups hit an in-memory LRU first and fall
+    back to a size-bounded SQLite file evicted by least recent access.
+    """
+
+    def __init__(self, db_path: str, version: str, memory_size: int = 256, max_entries: int = 10000):
+        self.db_path = db_path
+        self.version = version
+        self.max_entries = max_entries
+        self.memory = LRUCache(max_size=memory_size)
+
+        self._conn, self._lock = open_sqlite(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cv_extraction (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cv_extraction_accessed ON cv_extraction (accessed_at)")
+        self._conn.commit()
+
+    def key(self, file_bytes: bytes) -> str:
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        return f"{self.version}:{digest}"
+
+    def get(self, file_bytes: bytes) -> Optional[dict]:
+        key = self.key(file_bytes)
+        result = self.memory.get(key)
+        if result is not None:
+            return result
+
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT result FROM cv_extraction WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE cv_extraction SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"CV cache read failed: {e}")
+            return None
+
+        result = json.loads(row[0])
+        self.memory.set(key, result)
+        return result
+
+    def set(self, file_bytes: bytes, result: dict):
+        key = self.key(file_bytes)
+        self.memory.set(key, result)
+
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cv_extraction (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(result), now, now)
+                )
+                self._conn.execute(
+                    """
+                    DELETE FROM cv_extraction WHERE key IN (
+                        SELECT key FROM cv_extraction ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"CV cache write failed: {e}")
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            persisted = self._conn.execute("SELECT COUNT(*) FROM cv_extraction").fetchone()[0]
+        return {"memory": self.memory.stats, "persisted": persisted, "max_entries": self.max_entries}
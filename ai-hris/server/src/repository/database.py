@@ -1,57 +1,194 @@
 from src.config.env import AppConfig
-from azure.cosmos import CosmosClient
 import uuid
 from datetime import datetime
 from loguru import logger
+import numpy as np
+from src.common.quantization import INT8, EMBEDDING_FORMATS, cosine_similarity, dequantize_int8, quantize_int8
+
+_INVALID_ID_CHARS = ('/', '\\', '?', '#')
 
 class CosmosDB:
     def __init__(self, config: AppConfig):
+        from azure.cosmos import CosmosClient
+
         self.config = config
         self.client = CosmosClient(self.config.COSMOSDB_ENDPOINT, self.config.COSMOSDB_KEY)
         self.database = self.client.get_database_client(self.config.COSMOSDB_DATABASE)
         self.container = self.database.get_container_client(self.config.COSMOSDB_CONTAINER)
+        self._partition_key_path = None
+        self.embedding_format = self.config.EMBEDDING_STORAGE_FORMAT
+        if self.embedding_format not in EMBEDDING_FORMATS:
+            raise ValueError(f"Unsupported embedding storage format: {self.embedding_format}")
+        self.rescore_oversample = max(1, self.config.EMBEDDING_RESCORE_OVERSAMPLE)
+
+    @staticmethod
+    def document_id(candidate_id) -> str:
+        """Deterministic document id for a candidate, so re-indexing overwrites instead of duplicating"""
+        candidate_id = str(candidate_id)
+        if candidate_id and not any(char in candidate_id for char in _INVALID_ID_CHARS):
+            return candidate_id
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"candidate:{candidate_id}"))
+
+    @property
+    def partition_key_path(self) -> list[str]:
+        if self._partition_key_path is None:
+            properties = self.container.read()
+            path = properties['partitionKey']['paths'][0]
+            self._partition_key_path = [segment for segment in path.split('/') if segment]
+        return self._partition_key_path
+
+    def get_content_hashes(self, candidate_ids: list) -> dict:
+        """Return {candidateId: contentHash} for the candidates that are already indexed"""
+        if not candidate_ids:
+            return {}
+        items = self.container.query_items(
+            query="SELECT c.candidateId, c.contentHash FROM c WHERE ARRAY_CONTAINS(@candidate_ids, c.candidateId)",
+            parameters=[{"name": "@candidate_ids", "value": list(candidate_ids)}],
+            enable_cross_partition_query=True
+        )
+        return {item.get("candidateId"): item.get("contentHash") for item in items}
+
+    def iter_duplicate_documents(self):
+        """Yield ``(id, candidateId, partition key)`` of documents not stored under their candidate's document id.
+
+        These are legacy documents written with random ids before upserts were
+        keyed on the candidate, once a keyed document for the same candidate
+        exists. One cross-partition scan; run it from a migration, not per write.
+        """
+        partition_key = "".join(f'["{segment}"]' for segment in self.partition_key_path)
+        items = list(self.container.query_items(
+            query=f"SELECT c.id, c.candidateId, c{partition_key} AS pk FROM c",
+            enable_cross_partition_query=True
+        ))
+        keyed = {item["id"] for item in items}
+        for item in items:
+            keep_id = self.document_id(item.get("candidateId"))
+            if item["id"] != keep_id and keep_id in keyed:
+                yield item["id"], item.get("candidateId"), item.get("pk")
+
+    def encode_embedding(self, vector) -> dict:
+        """Document fields holding ``vector`` in the configured storage format"""
+        if self.embedding_format == INT8:
+            codes, scale = quantize_int8(vector)
+            return {'embeddings': codes, 'embeddingFormat': INT8, 'embeddingScale': scale}
+        return {
+            'embeddings': vector.tolist() if hasattr(vector, 'tolist') else list(vector),
+            'embeddingFormat': self.embedding_format
+        }
+
+    @staticmethod
+    def decode_embedding(item: dict) -> np.ndarray:
+        """Float embedding of a stored document (dequantized for int8 documents)"""
+        if item.get('embeddingFormat') == INT8:
+            return dequantize_int8(item.get('embeddings') or [], item.get('embeddingScale'))
+        return np.asarray(item.get('embeddings') or [], dtype=np.float32)
 
-    def insert_items(self, vector, candidate_id, name, skills, work_history, education_history):
+    def insert_items(self, vector, candidate_id, name, skills, work_history, education_history, content_hash: str = None):
         chat_item = {
-            'id': str(uuid.uuid4()),
+            'id': self.document_id(candidate_id),
             'candidateId': candidate_id,
             'name': name,
-            'embeddings': vector,
+            **self.encode_embedding(vector),
             'skills': skills,
             'workHistory': work_history,
             'educationHistory': education_history,
+            'contentHash': content_hash,
             'timestamp': datetime.utcnow().isoformat(),
         }
-        response = self.container.create_item(body=chat_item)
-        return response
+        return self.container.upsert_item(body=chat_item)
+
+    def iter_embeddings(self):
+        """Stream every candidate's id, name and embedding, e.g. to build a local vector index"""
+        return self.container.query_items(
+            query="SELECT c.id, c.candidateId, c.name, c.embeddings, c.embeddingFormat, c.embeddingScale, c.contentHash, c._ts FROM c",
+            enable_cross_partition_query=True
+        )
+
+    def get_embeddings(self, candidate_ids: list) -> list:
+        """Documents with id, name and embedding for the given candidates"""
+        if not candidate_ids:
+            return []
+        items = self.container.query_items(
+            query="SELECT c.id, c.candidateId, c.name, c.embeddings, c.embeddingFormat, c.embeddingScale FROM c WHERE ARRAY_CONTAINS(@candidate_ids, c.candidateId)",
+            parameters=[{"name": "@candidate_ids", "value": list(candidate_ids)}],
+            enable_cross_partition_query=True
+        )
+        return list(items)
+
+    def get_candidate_versions(self) -> dict:
+        """Return {candidateId: version} for every candidate without reading embeddings"""
+        items = self.container.query_items(
+            query="SELECT c.candidateId, c.contentHash, c._ts FROM c",
+            enable_cross_partition_query=True
+        )
+        return {item.get("candidateId"): self.document_version(item) for item in items}
+
+    @staticmethod
+    def document_version(item: dict) -> str:
+        # Documents indexed before content hashing fall back to their last-modified time.
+        return item.get("contentHash") or f"ts:{item.get('_ts')}"
+
+    def iter_documents(self, container_name: str = None):
+        """Stream full documents, from this container or another one in the same database"""
+        container = self.database.get_container_client(container_name) if container_name else self.container
+        return container.query_items(query="SELECT * FROM c", enable_cross_partition_query=True)
+
+    def get_profiles(self, candidate_ids: list) -> dict:
+        """Return {candidateId: {skills, workHistory}} without reading embeddings"""
+        if not candidate_ids:
+            return {}
+        items = self.container.query_items(
+            query="SELECT c.candidateId, c.skills, c.workHistory FROM c WHERE ARRAY_CONTAINS(@candidate_ids, c.candidateId)",
+            parameters=[{"name": "@candidate_ids", "value": list(candidate_ids)}],
+            enable_cross_partition_query=True
+        )
+        return {item.get("candidateId"): item for item in items}
 
-    def query_items(self, query_vector, num_results: int = 5):
+    def query_items(self, query_vector, num_results: int = 5, with_profile: bool = False):
         try:
+            quantized = self.embedding_format == INT8
+            profile_fields = "c.skills, c.workHistory," if with_profile else ""
+            rescore_fields = "c.embeddings, c.embeddingFormat, c.embeddingScale," if quantized else ""
             query = f"""
-            SELECT TOP @num_results c.id, c.candidateId, c.name,
+            SELECT TOP @num_results c.id, c.candidateId, c.name, {profile_fields} {rescore_fields}
             VectorDistance(c.embeddings, @embedding) AS SimilarityScore 
             FROM c 
             ORDER BY VectorDistance(c.embeddings, @embedding)
             """
+            # Quantized vectors are searched with a quantized query and an
+            # oversampled candidate list, then rescored below with the float query
+            # against the dequantized vectors, which only needs the stored scale.
             items = self.container.query_items(
                 query=query,
                 parameters=[
-                    {"name": "@num_results", "value": num_results},
-                    {"name": "@embedding", "value": query_vector}
+                    {"name": "@num_results", "value": num_results * self.rescore_oversample if quantized else num_results},
+                    {"name": "@embedding", "value": quantize_int8(query_vector)[0] if quantized else query_vector}
                 ],
                 enable_cross_partition_query=True
             )
+            items = list(items)
+            if quantized and items:
+                vectors = np.vstack([self.decode_embedding(item) for item in items])
+                scores = cosine_similarity(query_vector, vectors)
+                for item, score in zip(items, scores):
+                    item["SimilarityScore"] = float(score)
+                items.sort(key=lambda item: item["SimilarityScore"], reverse=True)
+                items = items[:num_results]
 
             recommendations = []
             for item in items:
-                recommendations.append({
+                recommendation = {
                     "id": item.get("id"),
                     "candidate_id": item.get("candidateId"),
                     "name": item.get("name"),
                     "similarity_score": item.get("SimilarityScore")
-                })
+                }
+                if with_profile:
+                    recommendation["skills"] = item.get("skills")
+                    recommendation["workHistory"] = item.get("workHistory")
+                recommendations.append(recommendation)
 
             return recommendations
         except Exception as e:
             logger.error(f"Error querying items: {e}")
-            raise ValueError(f"Error querying items: {e}")
\ No newline at end of file
+            raise ValueError(f"Error querying items: {e}")
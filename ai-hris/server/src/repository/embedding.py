@@ -1,12 +1,21 @@
 import os
+import hashlib
 from typing import List
 from loguru import logger
-from semantic_kernel.connectors.ai.open_ai import AzureTextEmbedding
 from src.config.env import AppConfig
+from src.common.cache import LRUCache
+from src.common.metrics import CACHE_LOOKUPS, track_llm_call
 
 class AzureAIEmbedding:
     def __init__(self, config: AppConfig):
+        from semantic_kernel.connectors.ai.open_ai import AzureTextEmbedding
+
         self.config = config
+        self.dimensions = self.config.EMBEDDING_DIMENSIONS or None
+        self.query_cache = LRUCache(
+            max_size=self.config.EMBEDDING_CACHE_SIZE,
+            ttl_seconds=self.config.EMBEDDING_CACHE_TTL_SECONDS or None
+        )
         self.embedding_service = AzureTextEmbedding(
             deployment_name=self.config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME,
             endpoint=self.config.AZURE_OPENAI_EMBEDDING_ENDPOINT,
@@ -14,16 +23,59 @@ class AzureAIEmbedding:
             api_version=self.config.AZURE_OPENAI_EMBEDDING_API_VERSION
         )
 
+    def _query_cache_key(self, query: str) -> str:
+        normalized = " ".join(query.split())
+        payload = f"{self.config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME}\x00{self.dimensions}\x00{normalized}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        # Call the underlying OpenAI client so the usage of this request can be
+        # recorded; the service's own token counters are shared by all calls.
+        deployment = self.config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME
+        options = {}
+        if self.dimensions:
+            # Only text-embedding-3 models accept a reduced output size.
+            options["dimensions"] = self.dimensions
+        async with track_llm_call("embedding", deployment) as call:
+            response = await self.embedding_service.client.embeddings.create(
+                input=texts,
+                model=deployment,
+                **options
+            )
+            if response.usage:
+                call.record_usage(response.usage.prompt_tokens)
+        return [item.embedding for item in response.data]
+
     async def generate_query_embedding(self, query: str) -> List[float]:
         """Generate embedding for search query."""
         try:
-            embeddings = await self.embedding_service.generate_embeddings([query])
+            cache_key = self._query_cache_key(query)
+            cached_vector = self.query_cache.get(cache_key)
+            CACHE_LOOKUPS.labels("query_embedding", "miss" if cached_vector is None else "hit").inc()
+            if cached_vector is not None:
+                return list(cached_vector)
+
+            embeddings = await self._embed([query])
             embedding_vector = embeddings[0]
             
             # Convert to list for JSON serialization
             if hasattr(embedding_vector, 'tolist'):
-                return embedding_vector.tolist()
-            return list(embedding_vector)
+                embedding_vector = embedding_vector.tolist()
+            else:
+                embedding_vector = list(embedding_vector)
+
+            self.query_cache.set(cache_key, tuple(embedding_vector))
+            return embedding_vector
         except Exception as e:
             logger.error(f"Error generating query embedding: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts with a single embedding request."""
+        if not texts:
+            return []
+        embeddings = await self._embed(texts)
+        return [
+            vector.tolist() if hasattr(vector, 'tolist') else list(vector)
+            for vector in embeddings
+        ]
@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from typing import Optional
+
+from loguru import logger
+
+from src.repository.sqlite_db import open_sqlite
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+ABANDONED_ERROR = "Job was abandoned before it finished"
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """SQLite-backed job status store.
+
+    Jobs run inside the process that accepted them, but their status and
+    result live here so a poll served by any worker process can answer.
+    Each job records the pid of that process so jobs it queued or was running
+    when it died can be failed. Finished jobs are pruned after ``retention_seconds``.
+    """
+
+    def __init__(self, db_path: str, retention_seconds: float = 86400):
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+
+        self._conn, self._lock = open_sqlite(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner_pid INTEGER
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "owner_pid" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner_pid INTEGER")
+        self._conn.commit()
+
+    def _execute(self, query: str, params: tuple):
+        with self._lock:
+            self._conn.execute(query, params)
+            self._conn.commit()
+
+    def create(self, job_type: str, payload: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, job_type, status, payload, created_at, owner_pid) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, QUEUED, json.dumps(payload), now, os.getpid())
+            )
+            self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (now - self.retention_seconds,)
+            )
+            self._conn.commit()
+        return job_id
+
+    def mark_running(self, job_id: str):
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = ?, owner_pid = ? WHERE id = ?",
+            (RUNNING, time.time(), os.getpid(), job_id)
+        )
+
+    def mark_succeeded(self, job_id: str, result):
+        self._execute(
+            "UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE id = ?",
+            (SUCCEEDED, json.dumps(result, default=str), time.time(), job_id)
+        )
+
+    def mark_failed(self, job_id: str, error: str):
+        try:
+            self._execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, error, time.time(), job_id)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record failure of job {job_id}: {e}")
+
+    def fail_abandoned(self, older_than_seconds: float) -> int:
+        """Fail queued/running jobs whose process died before finishing them.
+
+        A job is abandoned when its owner process is gone: its in-memory queue
+        died with it. A running job is also abandoned once it started more than
+        ``older_than_seconds`` ago, which covers jobs recorded without an owner
+        and owner pids reused by a new process.
+        """
+        now = time.time()
+        with self._lock:
+            pending = self._conn.execute(
+                "SELECT id, status, owner_pid, started_at FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchall()
+            abandoned = [
+                (FAILED, ABANDONED_ERROR, now, job_id, status)
+                for job_id, status, owner_pid, started_at in pending
+                if not _process_alive(owner_pid)
+                or (status == RUNNING and (started_at or 0) < now - older_than_seconds)
+            ]
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                abandoned
+            )
+            self._conn.commit()
+        return len(abandoned)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """The job's status and result; an unfinished job whose owner process is gone is failed first"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, job_type, status, result, error, created_at, started_at, finished_at, owner_pid FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+            if row is not None and row[2] in (QUEUED, RUNNING) and not _process_alive(row[8]):
+                finished_at = time.time()
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                    (FAILED, ABANDONED_ERROR, finished_at, job_id, row[2])
+                )
+                self._conn.commit()
+                row = row[:2] + (FAILED, row[3], ABANDONED_ERROR, row[5], row[6], finished_at, row[8])
+        if row is None:
+            return None
+        job_id, job_type, status, result, error, created_at, started_at, finished_at, _ = row
+        return {
+            "job_id": job_id,
+            "job_type": job_type,
+            "status": status,
+            "result": json.loads(result) if result is not None else None,
+            "error": error,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+        }
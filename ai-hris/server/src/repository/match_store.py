@@ -0,0 +1,132 @@
+import json
+import sqlite3
+import time
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+from src.repository.sqlite_db import open_sqlite
+
+
+class MatchStore:
+    """Open jobs and their precomputed top-K candidate matches.
+
+    ``open_jobs`` holds each job's details, content hash and embedding (cleared
+    when the hash changes so it is re-embedded). ``job_matches`` holds the
+    ranked matches with the job hash they were computed for, and
+    ``candidate_versions`` the candidate set (id and content version) the
+    matches reflect, which is what incremental refreshes diff against.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+        self._conn, self._lock = open_sqlite(db_path)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS open_jobs (
+                job_id TEXT PRIMARY KEY,
+                job TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                embedding BLOB,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_matches (
+                job_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                top_k INTEGER NOT NULL,
+                matches TEXT NOT NULL,
+                computed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS candidate_versions (
+                candidate_id TEXT PRIMARY KEY,
+                version TEXT NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def upsert_jobs(self, jobs: dict[str, tuple[dict, str]]) -> int:
+        """Store ``{job_id: (job, content_hash)}``; returns how many jobs are new or changed"""
+        now = time.time()
+        changed = 0
+        with self._lock:
+            existing = dict(self._conn.execute("SELECT job_id, content_hash FROM open_jobs").fetchall())
+            for job_id, (job, content_hash) in jobs.items():
+                if existing.get(job_id) == content_hash:
+                    continue
+                changed += 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO open_jobs (job_id, job, content_hash, embedding, updated_at) VALUES (?, ?, ?, NULL, ?)",
+                    (job_id, json.dumps(job), content_hash, now)
+                )
+            self._conn.commit()
+        return changed
+
+    def close_jobs(self, job_ids: list[str]) -> int:
+        """Remove jobs and their matches; returns how many open jobs were removed"""
+        if not job_ids:
+            return 0
+        placeholders = ','.join('?' * len(job_ids))
+        with self._lock:
+            removed = self._conn.execute(f"DELETE FROM open_jobs WHERE job_id IN ({placeholders})", job_ids).rowcount
+            self._conn.execute(f"DELETE FROM job_matches WHERE job_id IN ({placeholders})", job_ids)
+            self._conn.commit()
+        return removed
+
+    def list_jobs(self) -> list[dict]:
+        """Open jobs as ``{job_id, job, content_hash, embedding}`` (embedding may be None)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT job_id, job, content_hash, embedding FROM open_jobs ORDER BY job_id").fetchall()
+        return [
+            {
+                "job_id": job_id,
+                "job": json.loads(job),
+                "content_hash": content_hash,
+                "embedding": np.frombuffer(embedding, dtype=np.float32) if embedding is not None else None,
+            }
+            for job_id, job, content_hash, embedding in rows
+        ]
+
+    def set_embeddings(self, embeddings: dict[str, np.ndarray]):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE open_jobs SET embedding = ? WHERE job_id = ?",
+                [(np.asarray(vector, dtype=np.float32).tobytes(), job_id) for job_id, vector in embeddings.items()]
+            )
+            self._conn.commit()
+
+    def get_matches(self, job_id: str) -> Optional[dict]:
+        """``{content_hash, top_k, matches, computed_at}`` for a job, or None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT content_hash, top_k, matches, computed_at FROM job_matches WHERE job_id = ?", (job_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Job match read failed for {job_id}: {e}")
+            return None
+        if row is None:
+            return None
+        content_hash, top_k, matches, computed_at = row
+        return {"content_hash": content_hash, "top_k": top_k, "matches": json.loads(matches), "computed_at": computed_at}
+
+    def save_matches(self, matches: dict[str, tuple[str, list[dict]]], top_k: int, candidate_versions: dict[str, str]):
+        """Store ``{job_id: (content_hash, matches)}`` and the candidate set they were computed from, atomically"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO job_matches (job_id, content_hash, top_k, matches, computed_at) VALUES (?, ?, ?, ?, ?)",
+                [(job_id, content_hash, top_k, json.dumps(job_matches), now) for job_id, (content_hash, job_matches) in matches.items()]
+            )
+            self._conn.execute("DELETE FROM candidate_versions")
+            self._conn.executemany(
+                "INSERT INTO candidate_versions (candidate_id, version) VALUES (?, ?)",
+                list(candidate_versions.items())
+            )
+            self._conn.commit()
+
+    def candidate_versions(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT candidate_id, version FROM candidate_versions").fetchall())
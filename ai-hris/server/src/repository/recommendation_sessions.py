@@ -0,0 +1,61 @@
+import json
+import sqlite3
+import time
+from typing import Optional
+
+from loguru import logger
+
+from src.repository.sqlite_db import open_sqlite
+
+
+class RecommendationSessionStore:
+    """Pagination sessions of candidate recommendations, shared by all workers.
+
+    A session holds the job, its embedding and the ranked window served so far,
+    keyed by the session id in the pagination cursor. Keeping it in SQLite
+    rather than process memory lets any gunicorn worker serve the next page.
+    Sessions expire ``ttl_seconds`` after their last use; expired rows are
+    pruned on write.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 300):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+
+        self._conn, self._lock = open_sqlite(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS recommendation_sessions (
+                session_id TEXT PRIMARY KEY,
+                session TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, session_id: str) -> Optional[dict]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT session, updated_at FROM recommendation_sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Recommendation session read failed: {e}")
+            return None
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def set(self, session_id: str, session: dict):
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO recommendation_sessions (session_id, session, updated_at) VALUES (?, ?, ?)",
+                    (session_id, json.dumps(session, default=str), now)
+                )
+                self._conn.execute("DELETE FROM recommendation_sessions WHERE updated_at < ?", (now - self.ttl_seconds,))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Recommendation session write failed: {e}")
@@ -0,0 +1,60 @@
+import json
+import sqlite3
+import time
+from typing import Optional
+
+from loguru import logger
+
+from src.repository.sqlite_db import open_sqlite
+
+
+class ScoreStore:
+    """Stores per-attribute LLM scoring results keyed by candidate and rubric.
+
+    The stored sub-attribute percentages let recruiters change the
+    ``scoreDistribution`` weights and re-rank candidates without calling the
+    LLM again.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+        self._conn, self._lock = open_sqlite(db_path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidate_scores (
+                candidate_id TEXT NOT NULL,
+                rubric_key TEXT NOT NULL,
+                sub_attributes TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (rubric_key, candidate_id)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def save(self, candidate_id: str, rubric_key: str, sub_attributes: dict):
+        """Save ``{attributeName: subAttributes}`` for one candidate under a rubric"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO candidate_scores (candidate_id, rubric_key, sub_attributes, updated_at) VALUES (?, ?, ?, ?)",
+                    (str(candidate_id), rubric_key, json.dumps(sub_attributes), time.time())
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to store scores for candidate {candidate_id}: {e}")
+
+    def load(self, rubric_key: str, candidate_ids: Optional[list[str]] = None) -> dict[str, dict]:
+        """Load stored sub-attributes for a rubric, optionally limited to some candidates"""
+        query = "SELECT candidate_id, sub_attributes FROM candidate_scores WHERE rubric_key = ?"
+        params: list = [rubric_key]
+        if candidate_ids is not None:
+            if not candidate_ids:
+                return {}
+            query += f" AND candidate_id IN ({','.join('?' * len(candidate_ids))})"
+            params.extend(str(candidate_id) for candidate_id in candidate_ids)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return {candidate_id: json.loads(sub_attributes) for candidate_id, sub_attributes in rows}
@@ -0,0 +1,18 @@
+import os
+import sqlite3
+import threading
+
+
+def open_sqlite(db_path: str) -> tuple[sqlite3.Connection, threading.Lock]:
+    """Open a SQLite database shared by the threads of a process and by other processes.
+
+    Creates the parent directory, allows use from any thread (callers hold the
+    returned lock around every statement) and enables WAL so readers in other
+    worker processes do not block on writers.
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn, threading.Lock()
@@ -0,0 +1,309 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are not serialized across processes
+    fcntl = None
+
+import numpy as np
+from loguru import logger
+
+from src.repository.database import CosmosDB
+
+
+class CosmosVectorBackend:
+    """Vector search straight against the Cosmos DB container (``VectorDistance`` query)"""
+
+    def __init__(self, cosmosdb: CosmosDB):
+        self.cosmosdb = cosmosdb
+
+    def search(self, query_vector: List[float], num_results: int = 5, with_profile: bool = False) -> List[dict]:
+        return self.cosmosdb.query_items(query_vector, num_results=num_results, with_profile=with_profile)
+
+    def upsert(self, document_id: str, candidate_id: str, name: str, vector: List[float]):
+        # Cosmos is the source of truth; the write already happened.
+        pass
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+def _kmeans(vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 42) -> np.ndarray:
+    """Spherical k-means on unit vectors; returns unit-norm centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = np.bincount(assignments, minlength=nlist) == 0
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 16384) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = vectors[start:start + chunk_size]
+        assignments[start:start + chunk_size] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+@dataclass
+class _Snapshot:
+    vectors: np.ndarray
+    centroids: np.ndarray
+    offsets: np.ndarray
+    ids: List[str]
+    candidate_ids: List[str]
+    names: List[str]
+    built_at: float
+
+
+class LocalVectorIndex:
+    """In-process IVF (inverted file) index over float32 NumPy arrays.
+
+    Vectors are unit-normalized and grouped by their nearest k-means centroid,
+    so a query only scans the ``nprobe`` closest lists. Scores are cosine
+    similarities, matching the Cosmos ``VectorDistance`` ranking. Snapshots
+    are saved as ``.npy`` files and memory-mapped on load, so every worker
+    starts warm and shares the pages. Cosmos remains the source of truth:
+    writes since the last snapshot are kept in a small delta searched by
+    brute force, and dropped once a snapshot built after them is loaded.
+    Builds hold a file lock, so concurrent builders run one at a time.
+    """
+
+    def __init__(self, path: str, nprobe: int = 8, nlist: int = 0, reload_interval_seconds: float = 60):
+        self.path = path
+        self.nprobe = nprobe
+        self.nlist = nlist
+        self.reload_interval_seconds = reload_interval_seconds
+        self._snapshot: Optional[_Snapshot] = None
+        self._snapshot_mtime = None
+        self._last_reload_check = 0.0
+        self._delta: dict = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return len(self._delta)
+        # Delta entries for candidates already in the snapshot replace their rows.
+        known = set(snapshot.candidate_ids)
+        return len(snapshot.ids) + sum(1 for candidate_id in self._delta if candidate_id not in known)
+
+    def _meta_path(self, directory: str) -> str:
+        return os.path.join(directory, "meta.json")
+
+    @contextmanager
+    def _build_lock(self):
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        with open(f"{os.path.abspath(self.path)}.lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_or_build(self, records: Callable[[], Iterable[dict]]) -> bool:
+        """Load the snapshot, building it from ``records()`` if there is none.
+
+        When several processes start cold at once, one builds while the others
+        wait for the lock and then load its snapshot. Returns True if this
+        process built it.
+        """
+        if self.load():
+            return False
+        with self._build_lock():
+            if self.load():
+                return False
+            self._build(records())
+        return True
+
+    def build(self, records: Iterable[dict]):
+        """Build and persist a snapshot from ``{id, candidateId, name, embeddings}`` records"""
+        with self._build_lock():
+            self._build(records)
+
+    def _build(self, records: Iterable[dict]):
+        started = time.perf_counter()
+        # Writes after the scan starts may be missing from the snapshot, so the
+        # delta keeps them until a later snapshot.
+        built_at = time.time()
+        ids, candidate_ids, names, rows = [], [], [], []
+        for record in records:
+            embedding = record.get("embeddings")
+            if embedding is None or len(embedding) == 0:
+                continue
+            ids.append(record.get("id"))
+            candidate_ids.append(record.get("candidateId"))
+            names.append(record.get("name"))
+            # int8-quantized documents need no scale here: rows are unit-normalized below.
+            rows.append(np.asarray(embedding, dtype=np.float32))
+
+        if not rows:
+            raise ValueError("No embeddings found to build the vector index")
+
+        vectors = _normalize(np.vstack(rows))
+        nlist = self.nlist or int(np.clip(np.sqrt(len(vectors)), 1, 4096))
+        nlist = min(nlist, len(vectors))
+
+        rng = np.random.default_rng(42)
+        sample_size = min(len(vectors), nlist * 64)
+        sample = vectors[rng.choice(len(vectors), size=sample_size, replace=False)]
+        centroids = _kmeans(sample, nlist)
+
+        assignments = _assign(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assignments, minlength=nlist))
+
+        meta = {
+            "ids": [ids[i] for i in order],
+            "candidate_ids": [candidate_ids[i] for i in order],
+            "names": [names[i] for i in order],
+            "dimensions": int(vectors.shape[1]),
+            "built_at": built_at,
+        }
+
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".vector_index-", dir=parent)
+        np.save(os.path.join(staging, "vectors.npy"), vectors[order])
+        np.save(os.path.join(staging, "centroids.npy"), centroids)
+        np.save(os.path.join(staging, "offsets.npy"), offsets)
+        with open(self._meta_path(staging), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        # Swap the snapshot directory in place; readers that already mapped the
+        # old files keep working until they reload.
+        previous = None
+        if os.path.exists(self.path):
+            previous = f"{self.path}.old-{int(time.time() * 1000)}"
+            os.replace(self.path, previous)
+        os.replace(staging, self.path)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+
+        self.load()
+        logger.info(
+            f"Built vector index with {len(vectors)} vectors in {nlist} lists "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+    def load(self) -> bool:
+        meta_path = self._meta_path(self.path)
+        if not os.path.exists(meta_path):
+            return False
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        snapshot = _Snapshot(
+            vectors=np.load(os.path.join(self.path, "vectors.npy"), mmap_mode="r"),
+            centroids=np.load(os.path.join(self.path, "centroids.npy")),
+            offsets=np.load(os.path.join(self.path, "offsets.npy")),
+            ids=meta["ids"],
+            candidate_ids=meta["candidate_ids"],
+            names=meta["names"],
+            built_at=meta.get("built_at", 0.0),
+        )
+        with self._lock:
+            self._snapshot = snapshot
+            self._snapshot_mtime = os.path.getmtime(meta_path)
+            self._delta = {
+                candidate_id: entry for candidate_id, entry in self._delta.items()
+                if entry[3] >= snapshot.built_at
+            }
+            delta_size = len(self._delta)
+        logger.info(
+            f"Loaded vector index snapshot from {self.path} ({len(snapshot.ids)} vectors, {delta_size} newer writes kept)"
+        )
+        return True
+
+    def maybe_reload(self):
+        """Pick up a snapshot rebuilt by another process (e.g. the build CLI)"""
+        now = time.monotonic()
+        if now - self._last_reload_check < self.reload_interval_seconds:
+            return
+        self._last_reload_check = now
+        meta_path = self._meta_path(self.path)
+        if os.path.exists(meta_path) and os.path.getmtime(meta_path) != self._snapshot_mtime:
+            self.load()
+
+    def upsert(self, document_id: str, candidate_id: str, name: str, vector: List[float]):
+        if vector is None or len(vector) == 0:
+            return
+        normalized = _normalize(np.asarray(vector, dtype=np.float32))
+        with self._lock:
+            # Copy-on-write so concurrent searches can iterate the delta without locking.
+            delta = dict(self._delta)
+            delta[candidate_id] = (document_id, name, normalized, time.time())
+            self._delta = delta
+
+    def search(self, query_vector: List[float], num_results: int = 5, with_profile: bool = False) -> List[dict]:
+        # Profiles are not kept in the snapshot; callers fetch them from Cosmos when needed.
+        self.maybe_reload()
+        snapshot = self._snapshot
+        delta = self._delta
+        if snapshot is None and not delta:
+            raise RuntimeError("Vector index is empty; build it with build_vector_index.py")
+
+        query = _normalize(np.asarray(query_vector, dtype=np.float32))
+        results = []
+
+        if snapshot is not None:
+            nprobe = min(self.nprobe, len(snapshot.centroids))
+            centroid_scores = snapshot.centroids @ query
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+            rows = np.concatenate([
+                np.arange(snapshot.offsets[list_id], snapshot.offsets[list_id + 1])
+                for list_id in probe
+            ])
+            if len(rows):
+                # Lists are contiguous in the snapshot, so this reads a few slices of the mmap.
+                scores = np.concatenate([
+                    snapshot.vectors[snapshot.offsets[list_id]:snapshot.offsets[list_id + 1]] @ query
+                    for list_id in probe
+                ])
+                keep = min(len(rows), num_results + len(delta))
+                top = np.argpartition(-scores, keep - 1)[:keep]
+                for index in top:
+                    row = int(rows[index])
+                    candidate_id = snapshot.candidate_ids[row]
+                    if candidate_id in delta:
+                        continue
+                    results.append({
+                        "id": snapshot.ids[row],
+                        "candidate_id": candidate_id,
+                        "name": snapshot.names[row],
+                        "similarity_score": float(scores[index])
+                    })
+
+        for candidate_id, (document_id, name, vector, _) in delta.items():
+            results.append({
+                "id": document_id,
+                "candidate_id": candidate_id,
+                "name": name,
+                "similarity_score": float(vector @ query)
+            })
+
+        results.sort(key=lambda item: item["similarity_score"], reverse=True)
+        return results[:num_results]
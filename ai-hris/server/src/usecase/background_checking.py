@@ -1,36 +1,37 @@
-from playwright.sync_api import sync_playwright
-from openai import AzureOpenAI
+import asyncio
 import time
-from bs4 import BeautifulSoup
+from typing import Optional
+from urllib.parse import urlsplit
 import os
 from dotenv import load_dotenv
+from loguru import logger
+from src.repository.browser_pool import BrowserPool
+from src.llm.sentiment import SentimentClassifier, count_sentiments
+from src.repository.background_check_cache import BackgroundCheckCache
 
 load_dotenv()
 
+LINKEDIN_LOAD_FAILED = "Failed to load the page."
+TWEET_NOT_FOUND = "Tweet not found."
+
 #linkedin profile scraping (can only be professional accounts)
-def scrape_linkedin_description(url: str) -> str:
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(user_agent=(
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-        ))
-        page = context.new_page()
-        print(f"Visiting {url} ...")
-        
+async def scrape_linkedin_description(url: str, pool: BrowserPool) -> str:
+    async with pool.context() as context:
+        page = await context.new_page()
+        logger.info(f"Visiting {url} ...")
+
         try:
-            page.goto(url, timeout=20000)
-            page.wait_for_timeout(3000)
+            await page.goto(url, timeout=20000)
+            await page.wait_for_timeout(3000)
         except Exception as e:
-            print(f"Error visiting LinkedIn page: {e}")
-            browser.close()
-            return "Failed to load the page."
+            logger.warning(f"Error visiting LinkedIn page: {e}")
+            return LINKEDIN_LOAD_FAILED
 
-        html = page.content()
-        browser.close()
-        context.close()
+        html = await page.content()
 
     # Parse the HTML to extract description
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, 'html.parser')
     description_tag = soup.find('p', class_='break-words')
     if not description_tag:
@@ -39,136 +40,314 @@ def scrape_linkedin_description(url: str) -> str:
     description = description_tag.get_text(strip=True) if description_tag else "Description not found"
     return description
 
-#click the user's tweets
-def scrape_first_n_tweets_from_profile(username: str, n: int = 5):
-    tweets_content = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(viewport={"width": 1280, "height": 1080})
-        page = context.new_page()
-
-        page.goto(f"https://x.com/{username}")
-        page.wait_for_selector("[data-testid='primaryColumn']", timeout=15000)
-
-        tweet_links = set()
+_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+async def _block_heavy_resources(route):
+    # Tweet text and image URLs come from the GraphQL response, so the page
+    # itself never needs to download media.
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+#collect tweet urls from the profile timeline, yielding each one as soon as it shows up
+async def _iter_profile_tweet_links(page, username: str, n: int, scroll_timeout_ms: int = 3000):
+    seen = set()
+    await page.goto(f"https://x.com/{username}", wait_until="domcontentloaded")
+    await page.wait_for_selector("[data-testid='primaryColumn'] article", timeout=15000)
+
+    while len(seen) < n:
+        elements = await page.query_selector_all("article [href*='/status/']")
+        for e in elements:
+            href = await e.get_attribute("href")
+            if href and href.startswith(f"/{username}/status/") and "/" not in href.split("/status/", 1)[1]:
+                link = f"https://x.com{href}"
+                if link not in seen:
+                    seen.add(link)
+                    yield link
+            if len(seen) >= n:
+                return
+
+        article_count = len(await page.query_selector_all("article"))
+        await page.mouse.wheel(0, 1000)
+        try:
+            # Wait for the timeline to render more tweets instead of sleeping.
+            await page.wait_for_function(
+                "count => document.querySelectorAll('article').length > count",
+                arg=article_count,
+                timeout=scroll_timeout_ms
+            )
+        except Exception:
+            logger.info(f"No more tweets loaded for {username}, found {len(seen)}")
+            return
 
-        while len(tweet_links) < n:
-            elements = page.query_selector_all("article [href*='/status/']")
-            for e in elements:
-                href = e.get_attribute("href")
-                if href and href.startswith(f"/{username}/status/"):
-                    tweet_links.add(f"https://x.com{href}")
-                if len(tweet_links) >= n:
-                    break
-            page.mouse.wheel(0, 1000)
-            time.sleep(1.5)
+#click the user's tweets
+async def scrape_first_n_tweets_from_profile(username: str, pool: BrowserPool, n: int = 5, concurrency: int = 3, deadline_seconds: float = 30.0):
+    """Scrape the first ``n`` tweets of a profile.
+
+    Tweet pages are opened as soon as their links appear on the timeline, at
+    most ``concurrency`` at a time. Whatever has been scraped when
+    ``deadline_seconds`` runs out is returned.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = {}
+
+    async with pool.context(viewport={"width": 1280, "height": 1080}) as context:
+        await context.route("**/*", _block_heavy_resources)
+
+        async def _scrape(link: str) -> dict:
+            async with semaphore:
+                remaining_ms = max(1000, int((deadline - loop.time()) * 1000))
+                return await scrape_tweet_content(link, context, timeout_ms=min(10000, remaining_ms))
+
+        async def _collect_links():
+            page = await context.new_page()
+            try:
+                async for link in _iter_profile_tweet_links(page, username, n):
+                    tasks[link] = asyncio.create_task(_scrape(link))
+            finally:
+                await page.close()
 
-        print(f"\nFound {len(tweet_links)} tweet URLs. Scraping full content...\n")
+        try:
+            await asyncio.wait_for(_collect_links(), timeout=max(0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            logger.warning(f"Deadline reached while listing tweets for {username}")
+        except Exception as e:
+            logger.error(f"Error listing tweets for {username}: {e}")
 
-        for link in list(tweet_links)[:n]:
-            content = scrape_tweet_content(link, context)
-            tweets_content.append((link, content))
+        logger.info(f"Found {len(tasks)} tweet URLs for {username}, scraping full content")
 
-        browser.close()
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=max(0, deadline - loop.time()))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
+    tweets_content = []
+    for link, task in tasks.items():
+        if task.cancelled() or task.exception() is not None:
+            continue
+        tweets_content.append((link, task.result()))
     return tweets_content
 
-#scrape tweet content from user
-def scrape_tweet_content(url: str, context) -> dict:
-    _xhr_calls = []
-
-    def intercept_response(response):
-        if response.request.resource_type == "xhr":
-            _xhr_calls.append(response)
+def _parse_tweet_result(data: dict) -> dict:
+    result = data['data']['tweetResult']['result']
+    # Tweets with visibility restrictions are wrapped one level deeper.
+    legacy = result.get('legacy') or result['tweet']['legacy']
+    images = [
+        media['media_url_https']
+        for media in legacy.get('extended_entities', {}).get('media', [])
+        if media.get('type') == 'photo' and media.get('media_url_https')
+    ]
+    return {"text": legacy['full_text'], "images": images}
 
-    page = context.new_page()
-    page.on("response", intercept_response)
-    page.goto(url)
+#scrape tweet content from user
+async def scrape_tweet_content(url: str, context, timeout_ms: int = 10000) -> dict:
+    page = await context.new_page()
     try:
-        page.wait_for_selector("[data-testid='tweet']", timeout=2000)
+        async with page.expect_response(lambda response: "TweetResultByRestId" in response.url, timeout=timeout_ms) as response_info:
+            await page.goto(url, wait_until="commit", timeout=timeout_ms)
+        response = await response_info.value
+        return _parse_tweet_result(await response.json())
     except Exception as e:
-        print(f"Timeout waiting for tweet selector on {url}: {e}")
-        page.close()
-        return {"text": "Tweet not found.", "images": []}
+        logger.warning(f"Failed to extract tweet on {url}: {e}")
+        return {"text": TWEET_NOT_FOUND, "images": []}
+    finally:
+        await page.close()
 
-    time.sleep(2)
+DEPLOYMENT_NAME = "gpt-4.1-mini"
 
-    tweet_calls = [f for f in _xhr_calls if "TweetResultByRestId" in f.url]
-    tweet_text = "Tweet not found."
-    for xhr in tweet_calls:
+_sentiment_classifier = None
+
+def get_sentiment_classifier() -> SentimentClassifier:
+    global _sentiment_classifier
+    if _sentiment_classifier is None:
+        from openai import AsyncAzureOpenAI
+
+        client = AsyncAzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+        )
+        _sentiment_classifier = SentimentClassifier(client=client, deployment=DEPLOYMENT_NAME)
+    return _sentiment_classifier
+
+async def analyze_sentiments_llm(texts: list[str], classifier: SentimentClassifier = None) -> list[Optional[str]]:
+    """Classify all texts of a background check in as few LLM calls as possible"""
+    classifier = classifier or get_sentiment_classifier()
+    return await classifier.classify(texts)
+
+
+def profile_cache_key(source: str, profile: str) -> str:
+    if source == "linkedin":
+        parts = urlsplit(profile.strip().lower())
+        profile = f"{parts.netloc.removeprefix('www.')}{parts.path.rstrip('/')}"
+    else:
+        profile = profile.strip().lstrip("@").lower()
+    return f"{source}:{profile}"
+
+
+class BackgroundChecker:
+    """Online background check over a LinkedIn page and/or an X profile.
+
+    Scraped content and sentiment labels are cached per profile. Entries
+    younger than ``ttl_seconds`` are served as is; entries up to
+    ``stale_seconds`` older are served immediately while a single refresh runs
+    in the background; anything older, or any profile with ``force_refresh``,
+    is scraped again before returning. Concurrent checks of the same profile
+    share one scrape.
+    """
+
+    def __init__(self, pool: BrowserPool, classifier: SentimentClassifier = None, cache: BackgroundCheckCache = None,
+                 ttl_seconds: float = 86400, stale_seconds: float = 7 * 86400, tweets_per_profile: int = 5):
+        self.pool = pool
+        self.classifier = classifier
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.tweets_per_profile = tweets_per_profile
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def _scrape(self, source: str, profile: str) -> Optional[list[dict]]:
+        """Items without sentiment, or None when the profile could not be scraped"""
         try:
-            data = xhr.json()
-            tweet_text = data['data']['tweetResult']['result']['legacy']['full_text']
-            break
+            if source == "linkedin":
+                description = await scrape_linkedin_description(profile, self.pool)
+                if description == LINKEDIN_LOAD_FAILED:
+                    return None
+                return [{"text": description, "images": []}]
+
+            tweets = await scrape_first_n_tweets_from_profile(profile, self.pool, n=self.tweets_per_profile)
+            unique = {}
+            for url, content in tweets:
+                if content["text"] != TWEET_NOT_FOUND:
+                    # Use text+images as the key to avoid duplicates
+                    unique.setdefault((content["text"], tuple(content["images"])), {"url": url, **content})
+            return list(unique.values()) or None
         except Exception as e:
-            print(f"Failed to extract tweet text on {url}: {e}")
-
-    image_elements = page.query_selector_all("article [data-testid='tweetPhoto'] img")
-    images = []
-    for img in image_elements:
-        src = img.get_attribute("src")
-        if src:
-            images.append(src)
-
-    page.close()
-
-    return {"text": tweet_text, "images": images}
-
-client = AzureOpenAI(
-    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-)
-
-DEPLOYMENT_NAME = "gpt-4.1-mini"
+            logger.error(f"Error scraping {source} profile {profile}: {e}")
+            return None
+
+    async def _fetch(self, profiles: list[tuple[str, str]]) -> dict[str, dict]:
+        scraped = await asyncio.gather(*[self._scrape(source, profile) for source, profile in profiles])
+        texts = [item["text"] for items in scraped if items for item in items]
+        labels = iter(await analyze_sentiments_llm(texts, self.classifier) if texts else [])
+
+        results = {}
+        for (source, profile), items in zip(profiles, scraped):
+            key = profile_cache_key(source, profile)
+            for item in items or []:
+                item["sentiment"] = next(labels)
+            results[key] = {
+                "source": source,
+                "profile": profile,
+                "status": "ok" if items else "failed",
+                "items": items or [],
+                "sentiment_counts": count_sentiments([item["sentiment"] for item in items or []]),
+                "fetched_at": time.time(),
+            }
+            # Failed scrapes are retried on the next check instead of being cached.
+            if items and self.cache is not None:
+                await asyncio.to_thread(self.cache.set, key, results[key])
+        return results
+
+    def _start_fetch(self, profiles: list[tuple[str, str]]) -> dict[str, asyncio.Task]:
+        """Start one fetch for the profiles not already being fetched; return a task per profile"""
+        tasks = {}
+        missing = []
+        for source, profile in profiles:
+            key = profile_cache_key(source, profile)
+            if key in self._inflight:
+                tasks[key] = self._inflight[key]
+            else:
+                missing.append((source, profile))
+
+        if missing:
+            task = asyncio.create_task(self._fetch(missing))
+            for source, profile in missing:
+                key = profile_cache_key(source, profile)
+                self._inflight[key] = task
+                tasks[key] = task
+
+            def _done(done_task, keys=[profile_cache_key(*item) for item in missing]):
+                for key in keys:
+                    if self._inflight.get(key) is done_task:
+                        del self._inflight[key]
+                if not done_task.cancelled() and done_task.exception() is not None:
+                    logger.error(f"Background check refresh failed: {done_task.exception()}")
+
+            task.add_done_callback(_done)
+        return tasks
+
+    async def run(self, linkedin_url: str = None, x_username: str = None, force_refresh: bool = False) -> dict:
+        profiles = []
+        if linkedin_url:
+            profiles.append(("linkedin", linkedin_url))
+        if x_username:
+            profiles.append(("x", x_username))
+        if not profiles:
+            raise ValueError("linkedin_url or x_username is required")
+
+        results, cache_status, to_fetch, to_refresh = {}, {}, [], []
+        for source, profile in profiles:
+            key = profile_cache_key(source, profile)
+            entry = None
+            if self.cache is not None and not force_refresh:
+                entry = await asyncio.to_thread(self.cache.get, key)
+
+            if entry is not None and entry[1] < self.ttl_seconds:
+                results[key], cache_status[key] = entry[0], "hit"
+            elif entry is not None and entry[1] < self.ttl_seconds + self.stale_seconds:
+                results[key], cache_status[key] = entry[0], "stale"
+                to_refresh.append((source, profile))
+            else:
+                cache_status[key] = "refresh" if force_refresh else "miss"
+                to_fetch.append((source, profile))
+
+        if to_refresh:
+            self._start_fetch(to_refresh)
+        if to_fetch:
+            tasks = self._start_fetch(to_fetch)
+            for key, task in tasks.items():
+                # The fetch may be shared with other checks, so cancelling this
+                # one (e.g. on a job timeout) must not cancel the fetch itself.
+                results[key] = (await asyncio.shield(task))[key]
+
+        checked = []
+        for source, profile in profiles:
+            key = profile_cache_key(source, profile)
+            checked.append({**results[key], "cache": cache_status[key]})
+
+        sentiment_counts = count_sentiments([
+            item["sentiment"] for result in checked for item in result["items"]
+        ])
+        has_items = any(sentiment_counts.values())
+        return {
+            "profiles": checked,
+            "sentiment_counts": sentiment_counts,
+            "conclusion": max(sentiment_counts, key=sentiment_counts.get) if has_items else None,
+        }
+
+
+async def _main():
+    pool = BrowserPool(size=1)
+    try:
+        checker = BackgroundChecker(pool=pool)
+        result = await checker.run(
+            linkedin_url="https://www.linkedin.com/company/microsoft/",
+            # #dummy data tryout
+            x_username="elonmusk"
+        )
 
-def analyze_sentiment_llm(text: str) -> str:
-    prompt = (
-        "Analyze the sentiment of the following text. "
-        "Respond strictly with one of: 'Positive', 'Negative', or 'Neutral'. "
-        "You're a very strict investigator confident with your classification. "
-        "Do not add explanations or extra text.\n\n"
-        f"Text:\n\"{text}\""
-    )
-
-    response = client.chat.completions.create(
-        model=DEPLOYMENT_NAME,
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a sentiment analysis assistant that must strictly classify sentiment as 'Positive', 'Negative', or 'Neutral' only."
-                ),
-            },
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.0,
-    )
-    return response.choices[0].message.content.strip()
+        for profile in result["profiles"]:
+            print(f"{profile['source']} {profile['profile']}: {profile['status']} ({profile['cache']})")
+        print("Sentiment summary:", result["sentiment_counts"])
+        print(f"Sentiment Conclusion: {result['conclusion']}")
+    finally:
+        await pool.close()
 
 
 if __name__ == "__main__":
-    linkedin_description = scrape_linkedin_description("https://www.linkedin.com/company/microsoft/")
-    tweet_set = set()
-    sentiment_counts = {"Negative": 0, "Neutral": 0, "Positive": 0}
-    print(linkedin_description)
-    sentiment_counts[analyze_sentiment_llm(linkedin_description)] += 1
-    # #dummy data tryout
-    tweets = scrape_first_n_tweets_from_profile("elonmusk", n=5)
-
-    for url, content in tweets:
-        text = content["text"]
-        images = content["images"]
-
-        # Use text+images as a tuple to avoid duplicates
-        tweet_set.add((text, tuple(images)))
-
-    for text, images in tweet_set:
-        sentiment = analyze_sentiment_llm(text)
-        sentiment_counts[sentiment] += 1
-
-    print("Sentiment summary:", sentiment_counts)
-    max_sentiment = max(sentiment_counts, key=sentiment_counts.get)
-    print(f"Sentiment Conclusion: {max_sentiment}")
-
+    asyncio.run(_main())
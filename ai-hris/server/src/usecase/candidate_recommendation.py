@@ -1,43 +1,347 @@
-from azure.search.documents import SearchClient
-from azure.core.credentials import AzureKeyCredential
 import os
 import asyncio
-from typing import List, Dict
+import hashlib
+import json
+import uuid
+from typing import List, Dict, Optional
 from dotenv import load_dotenv
 from loguru import logger
-from semantic_kernel.connectors.ai.open_ai import AzureTextEmbedding
 from src.repository.database import CosmosDB
 from src.repository.embedding import AzureAIEmbedding
+from src.common.cache import LRUCache
+from src.repository.checkpoint import IndexingCheckpoint
+from src.repository.vector_index import CosmosVectorBackend
+from src.repository.match_store import MatchStore
+from src.usecase.reranking import rerank
 from src.domain.candidate_recommendation import CandidateData, JobData
 
 load_dotenv()
 
+PROFILE_FIELDS = ("skills", "workHistory")
+RECOMMENDATION_FIELDS = ("id", "candidate_id", "name", "similarity_score", "lexical_score", "rerank_score") + PROFILE_FIELDS
+
+class RecommendationCursorError(ValueError):
+    """Raised for an unknown, malformed or expired pagination cursor"""
+
+def candidate_content_hash(candidate_data: Dict, embedding_model: str = "", dimensions: int = 0, storage_format: str = "") -> str:
+    """Hash of the fields that feed the stored document, used to skip unchanged re-indexing.
+
+    The embedding model, dimensions and storage format are included so that
+    changing any of them re-embeds candidates instead of keeping old vectors.
+    """
+    payload = json.dumps([
+        embedding_model,
+        dimensions or 0,
+        storage_format,
+        candidate_data.get('candidate_name'),
+        candidate_data.get('candidate_skills'),
+        candidate_data.get('candidate_work_history'),
+        candidate_data.get('candidate_education_history'),
+    ], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def job_content_hash(job_detail: Dict, embedding_model: str = "", dimensions: int = 0) -> str:
+    """Hash of the job fields that feed its embedding, used to detect stale precomputed matches.
+
+    Like ``candidate_content_hash`` it covers the embedding dimensions, so jobs
+    are re-embedded when candidates are migrated to another size.
+    """
+    payload = json.dumps([embedding_model, dimensions or 0, job_detail.get('job_description')], default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
 class CandidateRecommendation:
-    def __init__(self, cosmosdb: CosmosDB, embedding_service: AzureAIEmbedding):
+    def __init__(self, cosmosdb: CosmosDB, embedding_service: AzureAIEmbedding, vector_backend=None, rerank_alpha: float = 0.7,
+                 page_window: int = 50, max_window: int = 1000, session_store=None, match_store: MatchStore = None):
         self.cosmosdb = cosmosdb
         self.embedding_service = embedding_service
+        self.vector_backend = vector_backend or CosmosVectorBackend(cosmosdb)
+        self.rerank_alpha = rerank_alpha
+        self.page_window = page_window
+        self.max_window = max_window
+        # Ranked first-stage results per pagination session, so later pages skip the vector query.
+        # Anything with get/set works; the server passes a RecommendationSessionStore shared by
+        # all workers, and the in-memory default only suits a single process.
+        self.session_store = session_store or LRUCache(max_size=256, ttl_seconds=300)
+        # Precomputed top-K matches of open jobs (see JobMatcher), read when a job_id is given.
+        self.match_store = match_store
+
+    async def _retrieve_with_profiles(self, embedding: List[float], top_k: int) -> List[Dict]:
+        candidates = await asyncio.to_thread(self.vector_backend.search, embedding, top_k, True)
+        return await self._attach_profiles(candidates)
+
+    async def _attach_profiles(self, candidates: List[Dict]) -> List[Dict]:
+        missing = [candidate['candidate_id'] for candidate in candidates if 'skills' not in candidate]
+        if missing:
+            profiles = await asyncio.to_thread(self.cosmosdb.get_profiles, missing)
+            for candidate in candidates:
+                profile = profiles.get(candidate['candidate_id'], {})
+                candidate.setdefault('skills', profile.get('skills'))
+                candidate.setdefault('workHistory', profile.get('workHistory'))
+        return candidates
+
+    async def _rank(self, job_detail: Dict, embedding: List[float], limit: int, rerank_pool: int = None, with_profile: bool = False) -> List[Dict]:
+        """Best ``limit`` candidates, re-ranked from the top ``rerank_pool`` when given"""
+        if rerank_pool:
+            candidates = await self._retrieve_with_profiles(embedding, rerank_pool)
+            return rerank(job_detail, candidates, num_results=limit, alpha=self.rerank_alpha)
+        if with_profile:
+            return await self._retrieve_with_profiles(embedding, limit)
+        return await asyncio.to_thread(self.vector_backend.search, embedding, limit)
+
+    @staticmethod
+    def _project(candidate: Dict, fields: Optional[List[str]] = None) -> Dict:
+        if fields:
+            return {field: candidate.get(field) for field in fields}
+        return {key: value for key, value in candidate.items() if key not in PROFILE_FIELDS}
 
-    async def recommend(self, job_detail: JobData):
+    def _precomputed_matches(self, job_detail: Dict, limit: int) -> Optional[List[Dict]]:
+        """Stored matches of an open job, when they cover ``limit`` and match the job's current content"""
+        job_id = job_detail.get('job_id')
+        if self.match_store is None or not job_id:
+            return None
+        stored = self.match_store.get_matches(str(job_id))
+        if stored is None:
+            return None
+        expected_hash = job_content_hash(
+            job_detail,
+            self.embedding_service.config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME,
+            dimensions=self.embedding_service.dimensions
+        )
+        if stored['content_hash'] != expected_hash:
+            logger.info(f"Precomputed matches of job {job_id} are for an older version of the job, querying live")
+            return None
+        matches = stored['matches']
+        # Fewer stored matches than top_k means every candidate was ranked.
+        if len(matches) < limit and len(matches) >= stored['top_k']:
+            return None
+        return [dict(match) for match in matches[:limit]]
+
+    async def recommend(self, job_detail: JobData, num_results: int = 5, top_k: int = None):
+        """Recommend candidates for a job.
+
+        With ``top_k`` set, runs two-stage retrieval: the vector backend returns the
+        top ``top_k`` candidates, which are re-ranked locally by skill overlap with
+        the job before the best ``num_results`` are returned.
+
+        When the job has a ``job_id`` with up-to-date precomputed matches, the
+        first stage is read from the match store instead of embedding the job
+        and querying the vector backend.
+        """
         try:
+            rerank_pool = top_k if top_k and top_k > num_results else None
+            precomputed = await asyncio.to_thread(self._precomputed_matches, job_detail, rerank_pool or num_results)
+            if precomputed is not None:
+                if rerank_pool:
+                    candidates = await self._attach_profiles(precomputed)
+                    precomputed = rerank(job_detail, candidates, num_results=num_results, alpha=self.rerank_alpha)
+                return [self._project(candidate) for candidate in precomputed]
+
             embedding = await self.embedding_service.generate_query_embedding(job_detail.get('job_description'))
-            result = self.cosmosdb.query_items(embedding)
-            return result
+            result = await self._rank(job_detail, embedding, num_results, rerank_pool=rerank_pool)
+            return [self._project(candidate) for candidate in result]
+        except Exception as e:
+            logger.error(f"Error recommending candidates: {e}")
+            raise ValueError(f"Error recommending candidates: {e}")
+
+    async def _load_session(self, cursor: str):
+        try:
+            session_id, offset = cursor.rsplit(":", 1)
+            offset = int(offset)
+        except (AttributeError, ValueError):
+            raise RecommendationCursorError("Malformed cursor")
+        session = await asyncio.to_thread(self.session_store.get, session_id)
+        if session is None or offset < 0:
+            raise RecommendationCursorError("Cursor is invalid or has expired")
+        return session_id, session, offset
+
+    async def recommend_page(self, job_detail: JobData = None, num_results: int = 5, offset: int = 0, cursor: str = None,
+                             top_k: int = None, fields: Optional[List[str]] = None) -> Dict:
+        """One page of recommendations plus a ``next_cursor`` for the following page.
+
+        The first request embeds the job and ranks a window of candidates (the
+        whole re-ranked ``top_k`` in two-stage mode). The window is kept for a
+        few minutes under the cursor, so later pages are served from the session
+        store by whichever worker receives them; in vector mode the window is widened from the stored embedding if a page
+        runs past it.
+        """
+        try:
+            with_profile = bool(fields) and any(field in PROFILE_FIELDS for field in fields)
+            if cursor:
+                session_id, session, offset = await self._load_session(cursor)
+            else:
+                embedding = await self.embedding_service.generate_query_embedding(job_detail.get('job_description'))
+                if not embedding:
+                    raise ValueError("Failed to generate query embedding")
+                session_id = uuid.uuid4().hex
+                session = {
+                    "job_detail": job_detail,
+                    "embedding": embedding,
+                    "top_k": top_k,
+                    "with_profile": with_profile,
+                    "results": None,
+                    "exhausted": False
+                }
+
+            end = offset + num_results
+            results = session["results"]
+            needs_profiles = with_profile and not session["with_profile"]
+            if results is None or needs_profiles or (len(results) < end and not session["exhausted"]):
+                session["with_profile"] = session["with_profile"] or with_profile
+                if session["top_k"]:
+                    limit = session["top_k"]
+                    results = await self._rank(session["job_detail"], session["embedding"], limit, rerank_pool=limit)
+                    session["exhausted"] = True
+                else:
+                    previous = len(results) if results else 0
+                    limit = min(self.max_window, max(end, self.page_window, previous * 2))
+                    results = await self._rank(session["job_detail"], session["embedding"], limit, with_profile=session["with_profile"])
+                    session["exhausted"] = len(results) < limit or limit >= self.max_window
+                session["results"] = results
+
+            await asyncio.to_thread(self.session_store.set, session_id, session)
+            has_more = end < len(results) or not session["exhausted"]
+            return {
+                "items": [self._project(candidate, fields) for candidate in results[offset:end]],
+                "offset": offset,
+                "num_results": num_results,
+                "next_cursor": f"{session_id}:{end}" if has_more else None
+            }
+        except RecommendationCursorError:
+            raise
         except Exception as e:
             logger.error(f"Error recommending candidates: {e}")
             raise ValueError(f"Error recommending candidates: {e}")
 
+    def _content_hash(self, candidate_data: Dict) -> str:
+        return candidate_content_hash(
+            candidate_data,
+            self.embedding_service.config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME,
+            dimensions=self.embedding_service.dimensions,
+            storage_format=self.cosmosdb.embedding_format
+        )
+
+    def _upsert(self, candidate_data: Dict, embedding: List[float], content_hash: str):
+        result = self.cosmosdb.insert_items(
+            vector=embedding,
+            candidate_id=candidate_data.get('candidate_id'),
+            name=candidate_data.get('candidate_name'),
+            skills=candidate_data.get('candidate_skills'),
+            education_history=candidate_data.get('candidate_education_history'),
+            work_history=candidate_data.get('candidate_work_history'),
+            content_hash=content_hash,
+        )
+        self.vector_backend.upsert(
+            document_id=self.cosmosdb.document_id(candidate_data.get('candidate_id')),
+            candidate_id=candidate_data.get('candidate_id'),
+            name=candidate_data.get('candidate_name'),
+            vector=embedding
+        )
+        return result
+
     async def indexing(self, candidate_data: CandidateData):
         try:
-            embedding = await self.embedding_service.generate_query_embedding(candidate_data.get('candidate_skills'))
-            result = self.cosmosdb.insert_items(
-                vector=embedding,
-                candidate_id=candidate_data.get('candidate_id'),
-                name=candidate_data.get('candidate_name'),
-                skills=candidate_data.get('candidate_skills'),
-                education_history=candidate_data.get('candidate_education_history'),
-                work_history=candidate_data.get('candidate_work_history'),
-            )
-            return result
+            candidate_id = candidate_data.get('candidate_id')
+            content_hash = self._content_hash(candidate_data)
+            existing_hashes = await asyncio.to_thread(self.cosmosdb.get_content_hashes, [candidate_id])
+            if existing_hashes.get(candidate_id) == content_hash:
+                logger.info(f"Candidate {candidate_id} is unchanged, skipping embedding")
+                status = "unchanged"
+            else:
+                embedding = await self.embedding_service.generate_query_embedding(candidate_data.get('candidate_skills'))
+                if not embedding:
+                    raise ValueError("Failed to generate embedding")
+                await asyncio.to_thread(self._upsert, candidate_data, embedding, content_hash)
+                status = "indexed"
+
+            return {
+                "id": self.cosmosdb.document_id(candidate_id),
+                "candidate_id": candidate_id,
+                "content_hash": content_hash,
+                "status": status
+            }
         except Exception as e:
             logger.error(f"Error indexing candidate data: {e}")
-            raise ValueError(f"Error indexing candidate data: {e}")
\ No newline at end of file
+            raise ValueError(f"Error indexing candidate data: {e}")
+
+    async def bulk_indexing(self, candidates: List[Dict], batch_size: int = 16, concurrency: int = 8, checkpoint: IndexingCheckpoint = None) -> Dict:
+        """Index many candidates: one embedding request per batch and concurrent Cosmos writes.
+
+        Writes of one batch overlap with the embedding request of the next. Candidates
+        whose content hash matches the stored one are not re-embedded, and with a
+        checkpoint, candidates already processed by an earlier run are skipped.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        summary = {"total": len(candidates), "indexed": 0, "unchanged": 0, "skipped": 0, "failed": 0, "errors": []}
+
+        pending = []
+        for candidate in candidates:
+            if checkpoint is not None and checkpoint.is_done(candidate.get('candidate_id')):
+                summary["skipped"] += 1
+            else:
+                pending.append(candidate)
+
+        def _record_failure(candidate_id, error):
+            summary["failed"] += 1
+            summary["errors"].append({"candidate_id": candidate_id, "error": str(error)})
+
+        async def _write(candidate: Dict, embedding: List[float], content_hash: str):
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(self._upsert, candidate, embedding, content_hash)
+                    return candidate.get('candidate_id')
+                except Exception as e:
+                    logger.error(f"Error indexing candidate {candidate.get('candidate_id')}: {e}")
+                    _record_failure(candidate.get('candidate_id'), e)
+                    return None
+
+        async def _flush(writes):
+            written = [candidate_id for candidate_id in await writes if candidate_id is not None]
+            summary["indexed"] += len(written)
+            if checkpoint is not None:
+                checkpoint.mark_done(written)
+
+        in_flight = None
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            content_hashes = [self._content_hash(candidate) for candidate in batch]
+            changed = list(zip(batch, content_hashes))
+            try:
+                existing_hashes = await asyncio.to_thread(
+                    self.cosmosdb.get_content_hashes,
+                    [candidate.get('candidate_id') for candidate in batch]
+                )
+                changed = [
+                    (candidate, content_hash)
+                    for candidate, content_hash in zip(batch, content_hashes)
+                    if existing_hashes.get(candidate.get('candidate_id')) != content_hash
+                ]
+                unchanged_ids = [
+                    candidate.get('candidate_id')
+                    for candidate, content_hash in zip(batch, content_hashes)
+                    if existing_hashes.get(candidate.get('candidate_id')) == content_hash
+                ]
+                summary["unchanged"] += len(unchanged_ids)
+                if checkpoint is not None:
+                    checkpoint.mark_done(unchanged_ids)
+
+                embeddings = await self.embedding_service.generate_embeddings(
+                    [candidate.get('candidate_skills') for candidate, _ in changed]
+                )
+            except Exception as e:
+                logger.error(f"Error embedding candidate batch starting at {start}: {e}")
+                for candidate, _ in changed:
+                    _record_failure(candidate.get('candidate_id'), e)
+                continue
+
+            if in_flight is not None:
+                await _flush(in_flight)
+            in_flight = asyncio.gather(*[
+                _write(candidate, embedding, content_hash)
+                for (candidate, content_hash), embedding in zip(changed, embeddings)
+            ])
+            logger.info(f"Processed candidates {start + 1}-{start + len(batch)} of {len(pending)} ({len(changed)} changed)")
+
+        if in_flight is not None:
+            await _flush(in_flight)
+
+        return summary
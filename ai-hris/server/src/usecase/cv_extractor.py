@@ -1,16 +1,42 @@
-import PyPDF2
 import io
 from src.llm.llm_sk import LLMService
 import base64
-import docx # not used in the final code, but kept for reference
-import docx2txt
+import hashlib
+import json
+import asyncio
+import time
+import zipfile
+import zlib
+from functools import lru_cache
+from typing import AsyncIterator, BinaryIO, Optional, Union
 from loguru import logger
+from src.common.const import ResponseStatus
+from src.common.json_stream import IncrementalJSONObjectParser
+from src.domain.cv_extractor import CVAttributeExtractionResponse, ExtractedText
+from src.llm.prompt import _get_cv_extractor_system_prompt
+from src.repository.cv_cache import CVExtractionCache
+from src.usecase.document_text import DocumentTextExtractor, TextCollector
+
+SUPPORTED_CV_EXTENSIONS = ('pdf', 'docx', 'doc')
+
+@lru_cache(maxsize=1)
+def cv_extraction_version() -> str:
+    """Short hash of the extractor prompt and response schema, used to version cached results"""
+    schema = json.dumps(CVAttributeExtractionResponse.model_json_schema(), sort_keys=True)
+    payload = _get_cv_extractor_system_prompt() + schema
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
 
 class CVExtractor:
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, cache: CVExtractionCache = None, text_extractor: DocumentTextExtractor = None, max_chars: Optional[int] = None):
         self.llm_service = llm_service
+        self.cache = cache
+        self.text_extractor = text_extractor
+        self.max_chars = max_chars
+
+    def read_pdf_text(self, pdf_file_path: str = None, pdf_bytes: bytes = None, max_chars: Optional[int] = None) -> ExtractedText:
+        """Read PDF pages lazily until the character budget is reached and join them once"""
+        import PyPDF2
 
-    def extract_text_from_pdf(self, pdf_file_path: str = None, pdf_bytes: bytes = None) -> str:
         try:
             if pdf_bytes:
                 pdf_file = io.BytesIO(pdf_bytes)
@@ -18,22 +44,22 @@ class CVExtractor:
                 pdf_file = open(pdf_file_path, 'rb')
             else:
                 raise ValueError("Either pdf_file_path or pdf_bytes must be provided")
-            
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            if pdf_file_path:
-                pdf_file.close()
-                
-            return text.strip()
-            
+
+            with pdf_file:
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
+                collector = TextCollector(max_chars)
+                collector.extend(page.extract_text() or "" for page in pdf_reader.pages)
+                return collector.result(total_pages=len(pdf_reader.pages))
+
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
 
+    def extract_text_from_pdf(self, pdf_file_path: str = None, pdf_bytes: bytes = None, max_chars: Optional[int] = None) -> str:
+        return self.read_pdf_text(pdf_file_path, pdf_bytes, max_chars).text
+
     def extract_text_from_docx(self, docx_file_path: str = None, docx_bytes: bytes = None) -> str:
+        import docx2txt
+
         try:
             if docx_bytes:
                 # Use docx2txt for bytes input
@@ -91,36 +117,201 @@ class CVExtractor:
         else:
             return 'unknown'
 
+    def _read_docx_text(self, docx_bytes: bytes) -> ExtractedText:
+        collector = TextCollector(self.max_chars)
+        collector.add(self.extract_text_from_docx(docx_bytes=docx_bytes))
+        return collector.result(total_pages=1)
+
+    async def _extract_text(self, file_bytes: bytes, file_type: str) -> ExtractedText:
+        """Parse the document off the event loop, in the process pool when one is configured"""
+        if file_type == 'pdf':
+            if self.text_extractor:
+                try:
+                    return await self.text_extractor.extract_pdf(file_bytes, max_chars=self.max_chars)
+                except Exception as e:
+                    raise Exception(f"Error extracting text from PDF: {str(e)}")
+            return await asyncio.to_thread(self.read_pdf_text, pdf_bytes=file_bytes, max_chars=self.max_chars)
+        elif file_type == 'docx':
+            if self.text_extractor:
+                try:
+                    return await self.text_extractor.extract_docx(file_bytes, max_chars=self.max_chars)
+                except Exception as e:
+                    raise Exception(f"Error extracting text from DOCX: {str(e)}")
+            return await asyncio.to_thread(self._read_docx_text, file_bytes)
+        elif file_type == 'doc':
+            return ExtractedText(text=self.extract_text_from_doc(doc_bytes=file_bytes))
+        else:
+            raise ValueError("The provided file is not a valid PDF, DOCX, or DOC file.")
+
     async def extract(self, pdf_file_path: str = None, pdf_bytes: bytes = None, base64_cv: str = None) -> dict:
+        result, _ = await self.extract_with_text_info(pdf_file_path=pdf_file_path, pdf_bytes=pdf_bytes, base64_cv=base64_cv)
+        return result
+
+    def _read_input(self, pdf_file_path: str = None, pdf_bytes: bytes = None, base64_cv: str = None) -> tuple[bytes, str]:
+        if pdf_bytes or pdf_file_path:
+            file_bytes = pdf_bytes
+            if not file_bytes:
+                with open(pdf_file_path, 'rb') as f:
+                    file_bytes = f.read()
+            if pdf_file_path:
+                file_type = pdf_file_path.lower().split('.')[-1]
+            else:
+                file_type = self._detect_file_type(file_bytes)
+        elif base64_cv:
+            file_bytes = self._decode_base64_file(base64_cv)
+            file_type = self._detect_file_type(file_bytes)
+        else:
+            raise ValueError("No valid file input provided")
+        return file_bytes, file_type
+
+    async def _read_text(self, file_bytes: bytes, file_type: str) -> ExtractedText:
+        extracted = await self._extract_text(file_bytes, file_type)
+        if extracted.truncated:
+            logger.warning(
+                f"CV text truncated: read {extracted.pages_read}/{extracted.total_pages} pages, "
+                f"{extracted.truncated_pages} pages and {extracted.truncated_chars} chars dropped"
+            )
+        return extracted
+
+    async def extract_with_text_info(self, pdf_file_path: str = None, pdf_bytes: bytes = None, base64_cv: str = None) -> tuple[dict, Optional[ExtractedText]]:
+        """Extract CV attributes and also return how much of the document was read (None on cache hits)"""
         try:
             logger.info("Starting CV extraction process")
-            if pdf_bytes or pdf_file_path:
-                file_extension = pdf_file_path.lower().split('.')[-1]
-                if file_extension == 'pdf':
-                    cv_text = self.extract_text_from_pdf(pdf_file_path, pdf_bytes)
-                elif file_extension == 'docx':
-                    cv_text = self.extract_text_from_docx(docx_file_path=pdf_file_path, docx_bytes=pdf_bytes)
-                elif file_extension == 'doc':
-                    cv_text = self.extract_text_from_doc(doc_file_path=pdf_file_path, doc_bytes=pdf_bytes)
-                else:
-                    raise ValueError("The provided file is not a valid PDF, DOCX, or DOC file.")
-            elif base64_cv:
-                cv_file = self._decode_base64_file(base64_cv)
-                file_type = self._detect_file_type(cv_file)
-                if file_type == 'pdf':
-                    cv_text = self.extract_text_from_pdf(pdf_bytes=cv_file)
-                elif file_type == 'docx':
-                    cv_text = self.extract_text_from_docx(docx_bytes=cv_file)
-                elif file_type == 'doc':
-                    cv_text = self.extract_text_from_doc(doc_bytes=cv_file)
-                else:
-                    raise ValueError("The provided base64 string does not represent a valid PDF, DOCX, or DOC file.")
-            else:
-                raise ValueError("No valid file input provided")
+            file_bytes, file_type = self._read_input(pdf_file_path=pdf_file_path, pdf_bytes=pdf_bytes, base64_cv=base64_cv)
+
+            if self.cache:
+                cached_result = self.cache.get(file_bytes)
+                if cached_result is not None:
+                    logger.info("CV extraction cache hit")
+                    return cached_result, None
+
+            extracted = await self._read_text(file_bytes, file_type)
 
-            result = await self.llm_service.extract_cv_attributes(cv_text=cv_text)
+            result = await self.llm_service.extract_cv_attributes(cv_text=extracted.text)
 
-            return result
+            if self.cache:
+                self.cache.set(file_bytes, result)
+
+            return result, extracted
             
         except Exception as e:
             raise Exception(f"Error extracting CV attributes: {str(e)}")
+
+    async def extract_stream(self, pdf_file_path: str = None, pdf_bytes: bytes = None, base64_cv: str = None) -> AsyncIterator[dict]:
+        """Stream CV extraction as events: each top-level field (and each history item) as
+        soon as the model has finished it, then ``done`` with the full result.
+
+        Cache hits replay the cached result as the same events.
+        """
+        logger.info("Starting streaming CV extraction process")
+        file_bytes, file_type = self._read_input(pdf_file_path=pdf_file_path, pdf_bytes=pdf_bytes, base64_cv=base64_cv)
+
+        if self.cache:
+            cached_result = self.cache.get(file_bytes)
+            if cached_result is not None:
+                logger.info("CV extraction cache hit")
+                for name, value in cached_result.items():
+                    if isinstance(value, list) and value:
+                        for index, item in enumerate(value):
+                            yield {"event": "item", "name": name, "index": index, "value": item}
+                    else:
+                        yield {"event": "field", "name": name, "value": value}
+                yield {"event": "done", "data": cached_result, "cached": True}
+                return
+
+        extracted = await self._read_text(file_bytes, file_type)
+        yield {"event": "document", **extracted.model_dump(exclude={"text"})}
+
+        parser = IncrementalJSONObjectParser()
+        async for chunk in self.llm_service.extract_cv_attributes_stream(cv_text=extracted.text):
+            for event in parser.feed(chunk):
+                yield event
+
+        result = parser.result()
+        if self.cache:
+            self.cache.set(file_bytes, result)
+        yield {"event": "done", "data": result, "cached": False}
+
+    def unpack_files(self, files: list[tuple[str, BinaryIO]], max_files: int, max_file_size: int) -> list[tuple[str, Union[bytes, ValueError]]]:
+        """Expand zip archives into their CV entries and cap the number and size of files.
+
+        ``files`` are seekable file objects (e.g. the upload streams), so sizes
+        are checked before anything is read and archives are read in place.
+        The file count is checked before each zip entry is read. Entries that
+        are too large or cannot be read (encrypted, unsupported compression,
+        corrupt) are returned with a ``ValueError`` instead of their bytes and
+        reported as failed by ``extract_bulk``; an archive that cannot be
+        opened at all raises ``ValueError``.
+        """
+        unpacked = []
+
+        def _add(name: str, size: int, read):
+            if len(unpacked) >= max_files:
+                raise ValueError(f"Too many files (maximum is {max_files})")
+            if size > max_file_size:
+                unpacked.append((name, ValueError("File exceeds the maximum allowed size")))
+                return
+            try:
+                unpacked.append((name, read()))
+            except (RuntimeError, NotImplementedError, zipfile.BadZipFile, zlib.error, EOFError) as e:
+                unpacked.append((name, ValueError(f"Could not read {name} from the archive: {e}")))
+
+        for filename, stream in files:
+            if filename.lower().endswith('.zip'):
+                try:
+                    with zipfile.ZipFile(stream) as archive:
+                        for info in archive.infolist():
+                            name = info.filename
+                            if info.is_dir() or name.startswith('__MACOSX/') or name.split('/')[-1].startswith('.'):
+                                continue
+                            if name.lower().split('.')[-1] not in SUPPORTED_CV_EXTENSIONS:
+                                continue
+                            _add(name, info.file_size, lambda: archive.read(info))
+                except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError) as e:
+                    raise ValueError(f"Invalid zip archive {filename}: {str(e)}")
+            else:
+                stream.seek(0, io.SEEK_END)
+                size = stream.tell()
+                stream.seek(0)
+                _add(filename, size, stream.read)
+
+        return unpacked
+
+    async def extract_bulk(self, files: list[tuple[str, Union[bytes, ValueError]]], concurrency: int = 4) -> AsyncIterator[dict]:
+        """Extract many CVs concurrently and yield per-file results in completion order"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _extract_one(index: int, filename: str, file_bytes: bytes) -> dict:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    if isinstance(file_bytes, ValueError):
+                        raise file_bytes
+                    if filename.lower().split('.')[-1] not in SUPPORTED_CV_EXTENSIONS:
+                        raise ValueError("Only PDF, DOCX, or DOC files are allowed")
+                    data, extracted = await self.extract_with_text_info(pdf_bytes=file_bytes, pdf_file_path=filename)
+                    status, error = ResponseStatus.Success, None
+                except Exception as e:
+                    logger.warning(f"Bulk CV extraction failed for {filename}: {e}")
+                    data, extracted, status, error = None, None, ResponseStatus.Failed, str(e)
+
+                return {
+                    "index": index,
+                    "filename": filename,
+                    "status": status.value,
+                    "data": data,
+                    "error": error,
+                    "text": extracted.model_dump(exclude={'text'}) if extracted else None,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+                }
+
+        tasks = [
+            asyncio.create_task(_extract_one(index, filename, file_bytes))
+            for index, (filename, file_bytes) in enumerate(files)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,9 +1,50 @@
 from src.llm.llm_sk import LLMService
+from src.llm.agent_registry import criteria_hash
+from src.common.const import ResponseStatus
+from src.repository.score_store import ScoreStore
 from loguru import logger
+import asyncio
+import copy
+from typing import Optional
+import numpy as np
+
+# Keys that hold weights or results rather than the rubric itself. subAttributes
+# stays in: it defines the options the LLM chooses from.
+_NON_RUBRIC_KEYS = {'scoreDistribution', 'totalScoreResult'}
+
+def rubric_key(predefined_score: dict) -> str:
+    """Hash of a rubric ignoring its weights, so weight tweaks map to the same stored scores.
+
+    Must be computed on the rubric as sent, before ``assess`` replaces its
+    subAttributes with the model's choices.
+    """
+    def _strip(value):
+        if isinstance(value, dict):
+            return {k: _strip(v) for k, v in value.items() if k not in _NON_RUBRIC_KEYS}
+        if isinstance(value, list):
+            return [_strip(v) for v in value]
+        return value
+    return criteria_hash(_strip(predefined_score))
+
+def rubric_error(predefined_score) -> Optional[str]:
+    """Why ``predefined_score`` cannot be rescored, or None when it is well formed"""
+    if not isinstance(predefined_score, dict):
+        return "predefined_score must be an object"
+    attributes = predefined_score.get('attributes')
+    if not isinstance(attributes, list) or not attributes:
+        return "predefined_score.attributes must be a non-empty list"
+    for index, item in enumerate(attributes):
+        if not isinstance(item, dict) or not isinstance(item.get('attributeName'), str):
+            return f"predefined_score.attributes[{index}] must be an object with an attributeName"
+        weight = item.get('scoreDistribution', 0)
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+            return f"predefined_score.attributes[{index}].scoreDistribution must be a number"
+    return None
 
 class CVScoring:
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, score_store: ScoreStore = None):
         self.llm_service = llm_service
+        self.score_store = score_store
 
     def _calculate_score_matrix(self, score_attributes: list):
         total_score = 0
@@ -17,8 +58,10 @@ class CVScoring:
         score_attributes['totalScoreResult'] = total_score
         return score_attributes
 
-    async def assess(self, predefined_score: str, candidate_data: str):
+    async def assess(self, predefined_score: str, candidate_data: str, candidate_id: str = None):
         try:
+            # Taken before the rubric's subAttributes are overwritten below.
+            key = rubric_key(predefined_score)
             result = await self.llm_service.score_cv(predefined_score, candidate_data)
 
             if not result:
@@ -36,6 +79,112 @@ class CVScoring:
             
             final_result = self._calculate_score_matrix(predefined_score)
 
+            if self.score_store and candidate_id:
+                self.score_store.save(
+                    candidate_id=candidate_id,
+                    rubric_key=key,
+                    sub_attributes={
+                        item['attributeName']: item.get('subAttributes', [])
+                        for item in predefined_score_attributes
+                    }
+                )
+
             return final_result
         except Exception as e:
-            raise RuntimeError(f"Error scoring CV: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Error scoring CV: {str(e)}")
+
+    async def assess_batch(self, predefined_score: dict, candidates: list[dict], concurrency: int = 8) -> dict:
+        """Score many candidates against one rubric and rank them by totalScoreResult"""
+        # Build the rubric agent once up front; every score_cv call below reuses it.
+        self.llm_service.agents.cv_scoring_agent(predefined_score)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _assess_one(candidate: dict) -> dict:
+            candidate_id = candidate.get('candidate_id')
+            async with semaphore:
+                try:
+                    result = await self.assess(
+                        predefined_score=copy.deepcopy(predefined_score),
+                        candidate_data=candidate.get('candidate_data'),
+                        candidate_id=candidate_id
+                    )
+                    return {
+                        "candidate_id": candidate_id,
+                        "status": ResponseStatus.Success.value,
+                        "totalScoreResult": result.get('totalScoreResult', 0),
+                        "result": result,
+                        "error": None
+                    }
+                except Exception as e:
+                    logger.warning(f"Batch scoring failed for candidate {candidate_id}: {e}")
+                    return {
+                        "candidate_id": candidate_id,
+                        "status": ResponseStatus.Failed.value,
+                        "totalScoreResult": None,
+                        "result": None,
+                        "error": str(e)
+                    }
+
+        results = await asyncio.gather(*[_assess_one(candidate) for candidate in candidates])
+
+        succeeded = sorted(
+            [item for item in results if item['error'] is None],
+            key=lambda item: item['totalScoreResult'],
+            reverse=True
+        )
+        failed = [item for item in results if item['error'] is not None]
+        for rank, item in enumerate(succeeded, start=1):
+            item['rank'] = rank
+        for item in failed:
+            item['rank'] = None
+
+        return {
+            "total": len(results),
+            "succeeded": len(succeeded),
+            "failed": len(failed),
+            "results": succeeded + failed
+        }
+
+    def rescore(self, predefined_score: dict, candidate_ids: list[str] = None) -> dict:
+        """Re-rank candidates with new scoreDistribution weights from stored LLM percentages.
+
+        Mirrors _calculate_score_matrix (only attributes with exactly one sub-attribute
+        count) as a single matrix-vector product over all candidates.
+        """
+        if not self.score_store:
+            raise RuntimeError("Score store is not configured")
+        error = rubric_error(predefined_score)
+        if error:
+            raise ValueError(error)
+
+        key = rubric_key(predefined_score)
+        stored = self.score_store.load(key, candidate_ids)
+
+        attributes = predefined_score.get('attributes', [])
+        attribute_names = [item['attributeName'] for item in attributes]
+        weights = np.array([float(item.get('scoreDistribution', 0)) for item in attributes], dtype=np.float64)
+
+        ids = list(stored)
+        percentages = np.zeros((len(ids), len(attribute_names)), dtype=np.float64)
+        for row, candidate_id in enumerate(ids):
+            sub_attributes = stored[candidate_id]
+            for col, name in enumerate(attribute_names):
+                details = sub_attributes.get(name)
+                if details and len(details) == 1:
+                    percentages[row, col] = details[0]['percentage']
+
+        scores = (percentages / 100) @ weights
+        order = np.argsort(-scores, kind='stable')
+
+        results = [
+            {"rank": rank, "candidate_id": ids[index], "totalScoreResult": float(scores[index])}
+            for rank, index in enumerate(order, start=1)
+        ]
+        missing = [candidate_id for candidate_id in (candidate_ids or []) if str(candidate_id) not in stored]
+
+        return {
+            "rubric_key": key,
+            "total": len(results),
+            "results": results,
+            "missing": missing
+        }
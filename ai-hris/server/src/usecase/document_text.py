@@ -0,0 +1,281 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Optional
+
+from loguru import logger
+
+from src.domain.cv_extractor import ExtractedText
+
+CHARS_PER_TOKEN = 4
+
+
+def char_budget(max_chars: int = 0, max_tokens: int = 0) -> Optional[int]:
+    """Combine a character and an (approximate) token budget; 0 disables either"""
+    budgets = [budget for budget in (max_chars, max_tokens * CHARS_PER_TOKEN) if budget and budget > 0]
+    return min(budgets) if budgets else None
+
+
+class TextCollector:
+    """Collects page texts until a character budget is reached, then joins them once"""
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+        self.parts: list[str] = []
+        self.chars = 0
+        self.pages_read = 0
+        self.truncated_chars = 0
+        self.exhausted = False
+
+    @property
+    def remaining(self) -> Optional[int]:
+        if self.max_chars is None:
+            return None
+        return max(0, self.max_chars - self.chars)
+
+    def add(self, page_text: str) -> bool:
+        """Add one page; returns False once the budget is used up"""
+        if self.exhausted:
+            return False
+        self.pages_read += 1
+        if self.max_chars is not None and self.chars + len(page_text) >= self.max_chars:
+            keep = self.max_chars - self.chars
+            self.parts.append(page_text[:keep])
+            self.truncated_chars += len(page_text) - keep
+            self.chars = self.max_chars
+            self.exhausted = True
+            return False
+        self.parts.append(page_text)
+        self.chars += len(page_text)
+        return True
+
+    def extend(self, pages: Iterable[str]) -> bool:
+        for page_text in pages:
+            if not self.add(page_text):
+                return False
+        return True
+
+    def result(self, total_pages: int) -> ExtractedText:
+        truncated_pages = max(0, total_pages - self.pages_read)
+        return ExtractedText(
+            text="\n".join(self.parts).strip(),
+            pages_read=self.pages_read,
+            total_pages=total_pages,
+            truncated=truncated_pages > 0 or self.truncated_chars > 0,
+            truncated_pages=truncated_pages,
+            truncated_chars=self.truncated_chars,
+        )
+
+
+# The functions below run inside worker processes, so they must stay top-level
+# (picklable) and only receive plain bytes/ints.
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Document parsing exceeded its time budget")
+
+
+def _start_deadline(timeout_seconds: float):
+    """Arm a repeating SIGALRM so a malformed document cannot pin a worker process.
+
+    The alarm keeps firing every second after the deadline because PyPDF2 swallows
+    some exceptions while recovering from broken cross-reference tables.
+    """
+    if timeout_seconds and hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout_seconds, 1.0)
+
+
+def _clear_deadline():
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _extract_pdf_pages(pdf_bytes: bytes, start: int, end: int, max_chars: Optional[int], timeout_seconds: float) -> tuple[int, list[str]]:
+    """Extract text of pages [start, end) and return it with the document's page count.
+
+    Pages are read lazily and reading stops once ``max_chars`` have been collected.
+    """
+    import PyPDF2
+
+    _start_deadline(timeout_seconds)
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        total_pages = len(reader.pages)
+        pages = []
+        chars = 0
+        for i in range(start, min(end, total_pages)):
+            page_text = reader.pages[i].extract_text() or ""
+            pages.append(page_text)
+            chars += len(page_text)
+            if max_chars is not None and chars >= max_chars:
+                break
+        return total_pages, pages
+    finally:
+        _clear_deadline()
+
+
+def _extract_docx_text(docx_bytes: bytes, timeout_seconds: float) -> str:
+    import docx2txt
+
+    _start_deadline(timeout_seconds)
+    try:
+        return docx2txt.process(io.BytesIO(docx_bytes))
+    finally:
+        _clear_deadline()
+
+
+class DocumentTextExtractor:
+    """Parses PDF/DOCX documents in a process pool, off the event loop.
+
+    Long PDFs are split into page ranges parsed in parallel. Every document
+    has a hard time budget (enforced in the worker with SIGALRM) and a page
+    budget, so malformed or huge files cannot pin a worker. If a worker still
+    overruns, its pool is retired: new work goes to a fresh pool, and the old
+    one is terminated only once its other in-flight tasks have finished.
+    """
+
+    def __init__(self, max_workers: int = None, pages_per_task: int = 10, max_pages: int = 100, timeout_seconds: float = 30.0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_pages = max_pages
+        self.timeout_seconds = timeout_seconds
+        self._executor = None
+        # In-flight task count of every live pool, and the retired pools
+        # waiting for theirs to drain before their processes are terminated.
+        self._in_flight: dict[ProcessPoolExecutor, int] = {}
+        self._retired: set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # The server process runs threads (event loop, gunicorn),
+                    # so workers must not be forked from it.
+                    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context(method)
+                    )
+                    logger.info(f"Started document parser pool with {self.max_workers} processes ({method})")
+        return self._executor
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor):
+        # ProcessPoolExecutor has no public way to kill a busy worker.
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _retire_executor(self, executor: ProcessPoolExecutor):
+        """Stop sending work to ``executor``; it is terminated once its in-flight tasks finish"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            if executor in self._in_flight:
+                self._retired.add(executor)
+
+    def _reset_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            retired = [executor] if executor is not None else []
+            retired += list(self._retired)
+            self._retired.clear()
+            self._in_flight.clear()
+        for executor in retired:
+            self._terminate(executor)
+
+    def _acquire(self) -> ProcessPoolExecutor:
+        executor = self.executor
+        with self._lock:
+            self._in_flight[executor] = self._in_flight.get(executor, 0) + 1
+        return executor
+
+    def _release(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if executor not in self._in_flight:
+                return
+            self._in_flight[executor] -= 1
+            drained = self._in_flight[executor] == 0 and executor in self._retired
+            if drained:
+                del self._in_flight[executor]
+                self._retired.discard(executor)
+        if drained:
+            logger.info("Retired document parser pool drained, terminating it")
+            self._terminate(executor)
+
+    async def _submit(self, deadline: float, fn, *args):
+        loop = asyncio.get_running_loop()
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise TimeoutError("Document parsing exceeded its time budget")
+        executor = self._acquire()
+        try:
+            future = loop.run_in_executor(executor, fn, *args, remaining)
+            # Small grace period so the in-worker alarm normally fires first. A
+            # worker that stops on time raises TimeoutError itself (the same class
+            # as asyncio.TimeoutError), so only a future still pending here means
+            # the worker is stuck.
+            done, _ = await asyncio.wait([future], timeout=remaining + 1)
+            if not done:
+                future.cancel()
+                logger.error("Document parser worker did not honour its time budget, retiring its pool")
+                self._retire_executor(executor)
+                raise TimeoutError("Document parsing exceeded its time budget")
+            return future.result()
+        except BrokenProcessPool:
+            logger.error("Document parser pool broke, recreating it")
+            self._retire_executor(executor)
+            raise
+        finally:
+            self._release(executor)
+
+    async def extract_pdf(self, pdf_bytes: bytes, max_chars: Optional[int] = None) -> ExtractedText:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+        collector = TextCollector(max_chars)
+
+        first_end = min(self.pages_per_task, self.max_pages) if self.max_pages else self.pages_per_task
+        total_pages, pages = await self._submit(deadline, _extract_pdf_pages, pdf_bytes, 0, first_end, max_chars)
+        page_limit = min(total_pages, self.max_pages) if self.max_pages else total_pages
+        if total_pages > page_limit:
+            logger.warning(f"PDF has {total_pages} pages, only the first {page_limit} are parsed")
+
+        ranges = [
+            (start, min(start + self.pages_per_task, page_limit))
+            for start in range(first_end, page_limit, self.pages_per_task)
+        ]
+        # Without a budget every range is parsed at once; with one, ranges are
+        # parsed a wave at a time so reading stops soon after the budget is hit.
+        wave_size = len(ranges) if max_chars is None else self.max_workers
+
+        has_budget = collector.extend(pages[:page_limit])
+        while has_budget and ranges:
+            wave, ranges = ranges[:wave_size], ranges[wave_size:]
+            chunks = await asyncio.gather(*[
+                self._submit(deadline, _extract_pdf_pages, pdf_bytes, start, end, collector.remaining)
+                for start, end in wave
+            ])
+            for _, chunk_pages in chunks:
+                if not collector.extend(chunk_pages):
+                    has_budget = False
+                    break
+
+        return collector.result(total_pages)
+
+    async def extract_docx(self, docx_bytes: bytes, max_chars: Optional[int] = None) -> ExtractedText:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+        text = await self._submit(deadline, _extract_docx_text, docx_bytes)
+        collector = TextCollector(max_chars)
+        collector.add(text.strip())
+        return collector.result(total_pages=1)
+
+    def shutdown(self):
+        self._reset_executor()
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from src.repository.database import CosmosDB
+from src.repository.embedding import AzureAIEmbedding
+from src.repository.match_store import MatchStore
+from src.repository.vector_index import _normalize
+from src.usecase.candidate_recommendation import job_content_hash
+
+
+def top_k_similar(job_vectors: np.ndarray, candidate_chunks: Iterable[np.ndarray], k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Top ``k`` candidates per job by cosine similarity.
+
+    Candidates arrive in chunks of rows; each chunk is scored against every job
+    with one matrix multiply and merged into the running top ``k``, so memory
+    stays at one chunk plus ``jobs x k`` whatever the number of candidates.
+    Returns ``(scores, rows)``, each ``jobs x min(k, candidates)`` and sorted by
+    descending score, where ``rows`` index the concatenated chunks.
+    """
+    jobs = _normalize(np.asarray(job_vectors, dtype=np.float32))
+    best_scores = np.empty((len(jobs), 0), dtype=np.float32)
+    best_rows = np.empty((len(jobs), 0), dtype=np.int64)
+    offset = 0
+    for chunk in candidate_chunks:
+        scores = jobs @ _normalize(chunk).T
+        rows = np.broadcast_to(np.arange(offset, offset + len(chunk), dtype=np.int64), scores.shape)
+        offset += len(chunk)
+        best_scores = np.concatenate([best_scores, scores], axis=1)
+        best_rows = np.concatenate([best_rows, rows], axis=1)
+        if best_scores.shape[1] > k:
+            keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+            best_rows = np.take_along_axis(best_rows, keep, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_rows, order, axis=1)
+
+
+class JobMatcher:
+    """Precomputes the top-K candidates of every open job.
+
+    ``refresh`` embeds new or changed jobs in bulk and brings each job's stored
+    matches up to date with the candidate set:
+
+    - a job without matches, whose content changed, or after ``full=True`` is
+      scored against every candidate with a chunked matrix multiply;
+    - otherwise only candidates added or changed since the previous refresh are
+      scored and merged into the stored top K. That is exact unless a stored
+      match was removed or its score dropped, in which case the job falls back
+      to a full pass.
+
+    ``CandidateRecommendation`` serves ``recommend`` calls that carry a
+    ``job_id`` from the stored matches.
+    """
+
+    def __init__(self, cosmosdb: CosmosDB, embedding_service: AzureAIEmbedding, store: MatchStore, top_k: int = 200,
+                 chunk_size: int = 8192, embedding_batch_size: int = 64, full_refresh_ratio: float = 0.2):
+        self.cosmosdb = cosmosdb
+        self.embedding_service = embedding_service
+        self.store = store
+        self.top_k = top_k
+        self.chunk_size = chunk_size
+        self.embedding_batch_size = embedding_batch_size
+        # Beyond this share of changed candidates a full pass is cheaper than merging.
+        self.full_refresh_ratio = full_refresh_ratio
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def _embedding_model(self) -> str:
+        return self.embedding_service.config.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME
+
+    def _candidate_chunks(self, metadata: List[Dict]) -> Iterator[np.ndarray]:
+        rows = []
+        for item in self.cosmosdb.iter_embeddings():
+            vector = self.cosmosdb.decode_embedding(item)
+            if not len(vector):
+                continue
+            metadata.append({"id": item.get("id"), "candidate_id": item.get("candidateId"), "name": item.get("name")})
+            rows.append(vector)
+            if len(rows) >= self.chunk_size:
+                yield np.vstack(rows)
+                rows = []
+        if rows:
+            yield np.vstack(rows)
+
+    def _full_matches(self, job_vectors: np.ndarray) -> List[List[Dict]]:
+        metadata: List[Dict] = []
+        scores, rows = top_k_similar(job_vectors, self._candidate_chunks(metadata), self.top_k)
+        return [
+            [{**metadata[row], "similarity_score": float(score)} for score, row in zip(job_scores, job_rows)]
+            for job_scores, job_rows in zip(scores, rows)
+        ]
+
+    def _changed_candidates(self, candidate_ids: List[str]) -> tuple[List[Dict], np.ndarray]:
+        metadata, rows = [], []
+        for start in range(0, len(candidate_ids), 500):
+            for item in self.cosmosdb.get_embeddings(candidate_ids[start:start + 500]):
+                vector = self.cosmosdb.decode_embedding(item)
+                if len(vector):
+                    metadata.append({"id": item.get("id"), "candidate_id": item.get("candidateId"), "name": item.get("name")})
+                    rows.append(vector)
+        return metadata, _normalize(np.vstack(rows)) if rows else np.empty((0, 0), dtype=np.float32)
+
+    def _merge(self, stored: List[Dict], changed: List[Dict], scores: np.ndarray, removed: set) -> Optional[List[Dict]]:
+        """Stored top K updated with re-scored candidates, or None when a full pass is needed"""
+        new_scores = {candidate["candidate_id"]: float(score) for candidate, score in zip(changed, scores)}
+        merged = {}
+        for match in stored:
+            candidate_id = match["candidate_id"]
+            if candidate_id in removed:
+                return None
+            if candidate_id in new_scores:
+                if new_scores[candidate_id] < match["similarity_score"]:
+                    return None
+                continue
+            merged[candidate_id] = match
+        for candidate, score in zip(changed, scores):
+            merged[candidate["candidate_id"]] = {**candidate, "similarity_score": float(score)}
+        return sorted(merged.values(), key=lambda match: match["similarity_score"], reverse=True)[:self.top_k]
+
+    async def _embed_jobs(self, jobs: List[Dict]) -> int:
+        pending = [job for job in jobs if job["embedding"] is None]
+        for start in range(0, len(pending), self.embedding_batch_size):
+            batch = pending[start:start + self.embedding_batch_size]
+            vectors = await self.embedding_service.generate_embeddings([job["job"].get("job_description") or "" for job in batch])
+            embeddings = {job["job_id"]: np.asarray(vector, dtype=np.float32) for job, vector in zip(batch, vectors)}
+            await asyncio.to_thread(self.store.set_embeddings, embeddings)
+            for job in batch:
+                job["embedding"] = embeddings[job["job_id"]]
+        return len(pending)
+
+    def register_jobs(self, jobs: List[Dict]) -> int:
+        """Add or update open jobs (dicts with ``job_id`` and the JobData fields)"""
+        return self.store.upsert_jobs({
+            str(job["job_id"]): (job, job_content_hash(job, self._embedding_model, dimensions=self.embedding_service.dimensions))
+            for job in jobs
+        })
+
+    def close_jobs(self, job_ids: List[str]) -> int:
+        return self.store.close_jobs([str(job_id) for job_id in job_ids])
+
+    def _compute(self, jobs: List[Dict], full: bool) -> Dict:
+        current_versions = self.cosmosdb.get_candidate_versions()
+        previous_versions = self.store.candidate_versions()
+        changed_ids = [candidate_id for candidate_id, version in current_versions.items() if previous_versions.get(candidate_id) != version]
+        removed = set(previous_versions) - set(current_versions)
+        if not previous_versions or len(changed_ids) + len(removed) > self.full_refresh_ratio * max(1, len(current_versions)):
+            full = True
+
+        results, needs_full = {}, []
+        incremental = not full and bool(changed_ids or removed)
+        changed, changed_vectors = self._changed_candidates(changed_ids) if incremental else ([], None)
+        if incremental:
+            # A changed candidate that no longer has an embedding drops out like a removed one.
+            removed |= set(changed_ids) - {candidate["candidate_id"] for candidate in changed}
+        for job in jobs:
+            stored = None if full else self.store.get_matches(job["job_id"])
+            if stored is None or stored["content_hash"] != job["content_hash"] or stored["top_k"] < self.top_k:
+                needs_full.append(job)
+                continue
+            matches = stored["matches"]
+            if incremental:
+                scores = changed_vectors @ _normalize(job["embedding"]) if changed else np.empty(0, dtype=np.float32)
+                matches = self._merge(matches, changed, scores, removed)
+                if matches is None:
+                    needs_full.append(job)
+                    continue
+            results[job["job_id"]] = (job["content_hash"], matches)
+
+        if needs_full:
+            job_matches = self._full_matches(np.vstack([job["embedding"] for job in needs_full]))
+            for job, matches in zip(needs_full, job_matches):
+                results[job["job_id"]] = (job["content_hash"], matches)
+
+        self.store.save_matches(results, self.top_k, current_versions)
+        return {
+            "jobs": len(jobs),
+            "full": len(needs_full),
+            "incremental": len(jobs) - len(needs_full),
+            "candidates": len(current_versions),
+            "changed_candidates": len(changed_ids),
+            "removed_candidates": len(removed),
+        }
+
+    async def refresh(self, jobs: Optional[List[Dict]] = None, closed_job_ids: Optional[List[str]] = None, full: bool = False) -> Dict:
+        """Register/close jobs, then bring the matches of every open job up to date"""
+        started = time.perf_counter()
+        self._lock = self._lock or asyncio.Lock()
+        async with self._lock:
+            changed_jobs = await asyncio.to_thread(self.register_jobs, jobs) if jobs else 0
+            closed = await asyncio.to_thread(self.close_jobs, closed_job_ids) if closed_job_ids else 0
+            open_jobs = await asyncio.to_thread(self.store.list_jobs)
+            embedded = await self._embed_jobs(open_jobs)
+            stats = await asyncio.to_thread(self._compute, open_jobs, full) if open_jobs else {"jobs": 0}
+
+        stats.update({
+            "changed_jobs": changed_jobs,
+            "closed_jobs": closed,
+            "embedded_jobs": embedded,
+            "seconds": round(time.perf_counter() - started, 3),
+        })
+        logger.info(f"Job matches refreshed: {stats}")
+        return stats
+
+    def get_matches(self, job_id: str, num_results: Optional[int] = None) -> Optional[Dict]:
+        stored = self.store.get_matches(str(job_id))
+        if stored is None:
+            return None
+        matches = stored["matches"][:num_results] if num_results else stored["matches"]
+        return {"job_id": str(job_id), "computed_at": stored["computed_at"], "matches": matches}
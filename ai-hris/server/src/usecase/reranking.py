@@ -0,0 +1,60 @@
+import re
+from typing import Dict, List
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "of", "on", "or", "our", "the", "to", "with", "we", "you", "your", "will", "have", "has",
+    "experience", "years", "year", "strong", "good", "knowledge", "ability", "skills", "skill",
+}
+
+
+def tokenize(text) -> set:
+    """Lower-cased word tokens that keep tech names like c++, c#, node.js intact"""
+    if not text:
+        return set()
+    if not isinstance(text, str):
+        text = " ".join(str(item) for item in text) if isinstance(text, (list, tuple)) else str(text)
+    return {token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS}
+
+
+def skill_phrases(text) -> set:
+    """Whole skill phrases from a semicolon/comma separated skills string"""
+    if not text or not isinstance(text, str):
+        return set()
+    return {phrase.strip().lower() for phrase in re.split(r"[;,\n]", text) if phrase.strip()}
+
+
+def lexical_score(job_detail: Dict, candidate: Dict) -> float:
+    """Share of the job's skill terms found in the candidate's skills and work history.
+
+    Exact skill-phrase matches and token matches are weighted equally.
+    """
+    job_skills = job_detail.get('job_skills') or ""
+    job_tokens = tokenize(job_skills) | tokenize(job_detail.get('job_title'))
+    job_phrases = skill_phrases(job_skills)
+
+    candidate_tokens = tokenize(candidate.get('skills')) | tokenize(candidate.get('workHistory'))
+    candidate_phrases = skill_phrases(candidate.get('skills'))
+
+    token_overlap = len(job_tokens & candidate_tokens) / len(job_tokens) if job_tokens else 0.0
+    if not job_phrases:
+        return token_overlap
+    phrase_overlap = len(job_phrases & candidate_phrases) / len(job_phrases)
+    return 0.5 * token_overlap + 0.5 * phrase_overlap
+
+
+def rerank(job_detail: Dict, candidates: List[Dict], num_results: int, alpha: float = 0.7) -> List[Dict]:
+    """Blend vector similarity with lexical skill overlap and keep the best ``num_results``"""
+    reranked = []
+    for candidate in candidates:
+        lexical = lexical_score(job_detail, candidate)
+        similarity = candidate.get('similarity_score') or 0.0
+        reranked.append({
+            **candidate,
+            "lexical_score": lexical,
+            "rerank_score": alpha * similarity + (1 - alpha) * lexical
+        })
+    reranked.sort(key=lambda item: item["rerank_score"], reverse=True)
+    return reranked[:num_results]
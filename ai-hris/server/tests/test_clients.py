@@ -0,0 +1,26 @@
+import os
+
+# Dummy endpoints so client constructors validate; nothing is called over the network.
+os.environ.setdefault('WARM_UP_ON_START', 'false')
+os.environ.setdefault('AZURE_OPENAI_API_BASE', 'https://example.invalid')
+os.environ.setdefault('AZURE_OPENAI_API_KEY', 'test-key')
+os.environ.setdefault('AZURE_OPENAI_DEPLOYMENT_NAME', 'test-deployment')
+os.environ.setdefault('AZURE_OPENAI_EMBEDDING_ENDPOINT', 'https://example.invalid')
+os.environ.setdefault('AZURE_OPENAI_EMBEDDING_API_KEY', 'test-key')
+
+import main
+
+
+class _FakeCosmosDB:
+    """CosmosClient connects on construction, so the database client is replaced"""
+
+    def __init__(self, config):
+        self.config = config
+
+
+def test_every_registered_client_builds(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'CosmosDB', _FakeCosmosDB)
+
+    assert main.clients.warm_up(), main.clients.status
+    assert main.clients.status['ready']
@@ -1,58 +1,54 @@
-from pydantic import BaseModel
+from decimal import Decimal
 from typing import Any
 
+import orjson
+from flask import Response as FlaskResponse
+from pydantic import BaseModel
+
 from src.common.const import ResponseStatus
 
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
 class Response(BaseModel):
     status: str
     message: str
     data: Any
+
+def _default(obj: Any):
+    # Types orjson does not handle natively, serialized the way pydantic's JSON mode does.
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', errors='replace')
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _json_response(status: ResponseStatus, message: str, status_code: int, data: Any = None, include_data: bool = True) -> FlaskResponse:
+    """Serialize the envelope and its data in a single orjson pass"""
+    envelope = {"status": status, "message": str(message)}
+    if include_data:
+        envelope["data"] = data
+    body = orjson.dumps(envelope, default=_default, option=_ORJSON_OPTIONS)
+    return FlaskResponse(body, status=status_code, mimetype='application/json')
     
 def response(status: ResponseStatus, message: str, status_code: int, data: Any = None):
-    rsp = Response(
-                status = status,
-                message = str(message),
-                data = data
-            )
-    return rsp.model_dump(mode='json'), status_code
+    return _json_response(status, message, status_code, data)
 
 def unauthorized_response(msg='Not authenticated'):
-    rsp = Response(
-                status = ResponseStatus.Error,
-                message = str(msg),
-                data=None
-            )
-    return rsp.model_dump(mode='json', exclude={'data'}), 401
+    return _json_response(ResponseStatus.Error, msg, 401, include_data=False)
 
 def internal_server_error(msg: str = 'Internal Server Error'):
-    rsp = Response(
-                status = ResponseStatus.Error,
-                message = str(msg),
-                data = None
-            )
-    return rsp.model_dump(mode='json', exclude={'data'}), 500
+    return _json_response(ResponseStatus.Error, msg, 500, include_data=False)
 
 def bad_request_error(msg : str = 'Missing required parameter'):
-    rsp = Response(
-                status = ResponseStatus.Error,
-                message = str(msg),
-                data = None
-            )
-    return rsp.model_dump(mode='json', exclude={'data'}), 400
+    return _json_response(ResponseStatus.Error, msg, 400, include_data=False)
 
 def not_found_error(msg: str = 'Resource not found'):
-    rsp = Response(
-                status = ResponseStatus.Error,
-                message = str(msg),
-                data = None
-            )
-    return rsp.model_dump(mode='json', exclude={'data'}), 404
+    return _json_response(ResponseStatus.Error, msg, 404, include_data=False)
 
 def ok(message: str = ResponseStatus.Success.name, 
        data: Any = None, status_code: int = 200):
-    rsp = Response(
-                status = ResponseStatus.Success,
-                message = str(message),
-                data = data
-            )
-    return rsp.model_dump(mode='json'), status_code
\ No newline at end of file
+    return _json_response(ResponseStatus.Success, message, status_code, data)